@@ -0,0 +1,264 @@
+# bench.py
+# Headless benchmark suite for copilot.py: runs the simulation and renderer
+# uncapped on SDL's dummy drivers through scripted stress scenarios and reports
+# frame-time percentiles split into update and draw.
+#
+#   python bench.py                          run every scenario, compare to baseline
+#   python bench.py artillery_storm -n 600   one scenario, 600 frames
+#   python bench.py --save-baseline          store this machine's numbers
+#   python bench.py --alloc                  add per-frame allocation figures
+#
+# Each frame is exactly one SIM_DT update followed by one draw_window() with no
+# clock, vsync or audio, so a seed replays the same game frame for frame.
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import copilot
+from copilot import EnemyType, PowerUp, PowerUpType, WIDTH, HEIGHT, SIM_DT
+
+BASELINE_FILE = "bench_baseline.json"
+DEFAULT_FRAMES = 900
+DEFAULT_SEED = 1234
+WARMUP_FRAMES = 30          # sprite/glyph caches fill here; not measured
+PERCENTILES = (50, 95, 99)
+TOLERANCE = 0.15            # allowed slowdown vs. the baseline before failing
+UNGATED = "_p99"            # p99 is reported but too noisy to fail a run on
+BENCH_LIVES = 99            # scenarios run endlessly; nobody should reach game over
+
+
+class HeldKeys(frozenset):
+    # stands in for pygame.key.get_pressed(): keys[K_x] is True while held
+    def __getitem__(self, key):
+        return key in self
+
+
+def strafe(frame, period=40):
+    # sweep left and right across the screen
+    return HeldKeys([pygame.K_a if (frame // period) % 2 == 0 else pygame.K_d])
+
+
+def drop_powerup(game, kind):
+    # a pickup landing on the player goes through the normal collection code
+    game.powerups.append(PowerUp(game.player.x, game.player.y, kind))
+
+
+def populate(game, count):
+    for _ in range(count):
+        kind = random.choices(list(EnemyType), weights=[50, 30, 20])[0]
+        game.enemies.spawn(random.randint(0, WIDTH - 40), random.randint(0, HEIGHT // 2), kind)
+
+
+# --- Scenarios
+# A scenario prepares a fresh Game and returns its script: script(frame) runs
+# before each update, may call Game's player actions and returns the held keys.
+
+def late_game(game):
+    # difficulty fully ramped: top enemy speed, top spawn rate, crowded field
+    game.score = 300
+    populate(game, 60)
+
+    def script(frame):
+        if frame % 10 == 0:
+            game.fire()
+        return strafe(frame)
+    return script
+
+
+def overdrive_plasma_cutter(game):
+    # overdrive, plasma ring and cutter blades all active at once
+    game.score = 150
+    populate(game, 40)
+
+    def script(frame):
+        if not game.overdrive_active:
+            game.overdrive_ready = True
+            game.overdrive_on_cooldown = False
+            game.activate_overdrive()
+        if not game.plasma_active:
+            drop_powerup(game, PowerUpType.PLASMA)
+        if not game.cutter_active and not game.cutter_blades:
+            drop_powerup(game, PowerUpType.CUTTER)
+        if frame % 6 == 0:
+            game.fire()
+        return strafe(frame)
+    return script
+
+
+def artillery_storm(game):
+    # a shell every half second, impacts overlapping
+    game.score = 150
+    populate(game, 40)
+
+    def script(frame):
+        if frame % 15 == 0:
+            game.artillery_available += 1
+            game.begin_artillery()
+            game.target_artillery((random.randint(100, WIDTH - 100), random.randint(80, HEIGHT - 200)))
+        return strafe(frame)
+    return script
+
+
+def particles_10k(game):
+    # ~10k live particles kept topped up
+    populate(game, 20)
+
+    def script(frame):
+        missing = 10000 - len(game.particles)
+        if missing > 0:
+            game.particles.burst(missing, (0, WIDTH), (0, HEIGHT), (-60, 60), (-60, 60), lifetime=2.0, color=(255, 160, 60))
+        return strafe(frame)
+    return script
+
+
+def rapid_fire_drone(game):
+    # rapid fire held permanently with the support drone out
+    game.score = 100
+    populate(game, 40)
+
+    def script(frame):
+        if not game.rapid_fire:
+            drop_powerup(game, PowerUpType.RAPID_FIRE)
+        keys = strafe(frame)
+        if game.support_drone is None:
+            keys = keys | {pygame.K_t}
+        return HeldKeys(keys)
+    return script
+
+
+SCENARIOS = {
+    "late_game": late_game,
+    "overdrive_plasma_cutter": overdrive_plasma_cutter,
+    "artillery_storm": artillery_storm,
+    "particles_10k": particles_10k,
+    "rapid_fire_drone": rapid_fire_drone,
+}
+
+
+# --- Runner
+
+def run_scenario(name, frames=DEFAULT_FRAMES, seed=DEFAULT_SEED, tracker=None):
+    # returns per-frame (update_ms, draw_ms) arrays for the measured frames;
+    # a tracker (copilot.alloc_tracker) is started after the warm-up, fed
+    # every measured frame and left running for the caller to read
+    random.seed(seed)
+    game = copilot.Game(score_file=None)
+    game.particles.rng = np.random.default_rng(seed)
+    # a fresh starfield: the old one carries scroll state from earlier runs
+    copilot.starfield = copilot.new_starfield(random.Random(seed))
+    game.lives = BENCH_LIVES
+    script = SCENARIOS[name](game)
+    copilot.renderer.invalidate()
+
+    update_ms = np.empty(frames)
+    draw_ms = np.empty(frames)
+    clock = time.perf_counter
+    for frame in range(-WARMUP_FRAMES, frames):
+        if frame == 0 and tracker is not None:
+            tracker.start()
+        pygame.event.pump()
+        start = clock()
+        game.update(SIM_DT, script(frame))
+        if not copilot.DIRTY_RECTS:
+            copilot.starfield.update(SIM_DT)
+        mid = clock()
+        copilot.draw_window(game, 0.5)
+        end = clock()
+        if frame >= 0:
+            update_ms[frame] = (mid - start) * 1000
+            draw_ms[frame] = (end - mid) * 1000
+            if tracker is not None:
+                tracker.end_frame()
+    return update_ms, draw_ms
+
+
+def summarize(update_ms, draw_ms):
+    result = {}
+    for part, samples in (("update", update_ms), ("draw", draw_ms), ("frame", update_ms + draw_ms)):
+        for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+            result[f"{part}_p{p}"] = round(float(value), 3)
+    return result
+
+
+def compare(name, result, baseline, tolerance):
+    # list of "metric: now vs base" strings that regressed beyond tolerance
+    regressions = []
+    for metric, base in baseline.get(name, {}).items():
+        if metric.endswith(UNGATED):
+            continue
+        now = result.get(metric)
+        if now is not None and base > 0 and now > base * (1 + tolerance):
+            regressions.append(f"{metric}: {now:.2f} vs {base:.2f} (+{(now / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmarks for copilot.py")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help="scenarios to run (default: all of %s)" % ", ".join(SCENARIOS))
+    parser.add_argument("-n", "--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write these results to the baseline file instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="fractional slowdown allowed before a metric counts as a regression")
+    parser.add_argument("--alloc", action="store_true",
+                        help="also replay each scenario under allocation tracking (slow) and report churn")
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    copilot.init_display(headless=True)
+    copilot.atlas.build()
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+
+    results = {}
+    failed = False
+    print(f"{'scenario':<26}{'update p50/p95/p99':>22}{'draw p50/p95/p99':>22}{'frame p99':>11}")
+    for name in args.scenarios or SCENARIOS:
+        result = summarize(*run_scenario(name, args.frames, args.seed))
+        results[name] = result
+        cols = ["/".join(f"{result[f'{part}_p{p}']:.2f}" for p in PERCENTILES) for part in ("update", "draw")]
+        print(f"{name:<26}{cols[0]:>22}{cols[1]:>22}{result['frame_p99']:>11.2f}")
+        if args.alloc:
+            # a second, untimed replay: tracking distorts the frame times
+            tracker = copilot.alloc_tracker
+            run_scenario(name, args.frames, args.seed, tracker)
+            result.update(tracker.summary())
+            print("\n".join("  " + line for line in tracker.report(top=5).splitlines()))
+            tracker.stop()
+        for line in compare(name, result, baseline, args.tolerance):
+            print(f"  REGRESSION {line}")
+            failed = True
+
+    if args.save_baseline:
+        saved = load_baseline(args.baseline)
+        saved.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+
+    pygame.quit()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
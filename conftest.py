@@ -0,0 +1,21 @@
+# Puts the repo root on sys.path so plain `pytest` can import copilot,
+# bench and telemetry (python -m pytest does that on its own), and runs
+# every test on SDL's dummy drivers.
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import copilot
+
+
+@pytest.fixture(scope="module")
+def display():
+    # headless window and sprite atlas for tests that draw
+    copilot.init_display(headless=True)
+    copilot.atlas.build()
+    yield
+    pygame.quit()
@@ -10,32 +10,316 @@ import random  # restored (shadow bug)
 import sys
 import json
 import os
+import time
 import math
+import cProfile
+import pstats
+import tracemalloc
+import threading
+import gzip
+import warnings
+from collections import OrderedDict
 from enum import Enum
 
+import numpy as np
+
 # =============================================================================
 #  Starship Defense (single-file Pygame shooter) - Patched (complete)
 # =============================================================================
 
-# --- Pygame init (video + audio)
-pygame.init()
-try:
-    pygame.mixer.init()
-except Exception:
-    pass  # allow running without audio device
+# Importing this module has no side effects: the window is opened by
+# init_display(), sounds are loaded by init_audio() and all game state
+# lives on a Game.
+
+# --- Timing
+# The simulation advances in fixed SIM_DT steps driven by real elapsed time
+# (speeds are px/s, timers are seconds); rendering runs at its own rate and
+# interpolates entity positions between the last two sim steps.
+SIM_HZ = 30
+SIM_DT = 1 / SIM_HZ
+RENDER_FPS_CAP = 144      # 0 = uncapped
+VSYNC = False             # needs a SCALED window; falls back to a plain one
+MAX_FRAME_TIME = 0.25     # clamp long stalls so the sim never spirals
+
+
+def rate_count(rate, dt):
+    # how many events of a per-second rate happen this step (stochastic rounding)
+    return int(rate * dt + random.random())
+
 
 # --- Screen setup
 WIDTH, HEIGHT = 1200, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Starship Defense")
+screen = None   # the window, opened by init_display()
+
+
+def init_display(headless=False):
+    # open the window and create everything tied to the display format;
+    # headless uses SDL's dummy video/audio drivers (no window, no device)
+    global screen, world, starfield, render_queue, font, large_font, small_font
+    if headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pygame.init()
+    screen = None
+    if VSYNC:
+        try:
+            screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED, vsync=1)
+        except pygame.error:
+            screen = None
+    if screen is None:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Starship Defense")
+    world = screen if RENDER_SCALE == 1 else pygame.Surface(world_xy(WIDTH, HEIGHT)).convert()
+    starfield = new_starfield()
+    render_queue = RenderQueue(*world.get_size())
+    try:
+        font = pygame.font.Font("space age.ttf", 24)
+        large_font = pygame.font.Font("space age.ttf", 48)
+        small_font = pygame.font.Font("space age.ttf", 16)
+    except Exception:
+        font = pygame.font.SysFont(None, 24)
+        large_font = pygame.font.SysFont(None, 48)
+        small_font = pygame.font.SysFont(None, 16)
+
+# --- Render scale
+# The world (everything but the HUD and the pointer overlays) can be drawn
+# into an offscreen surface at a fraction of the window resolution and
+# scaled up once per frame. Gameplay coordinates stay in window units and
+# are mapped to world pixels only at draw time; 1.0 draws straight into the
+# window.
+RENDER_SCALE = 1.0        # e.g. 0.5, 0.75 or 1.0
+
+
+def world_xy(x, y):
+    return (int(x * RENDER_SCALE), int(y * RENDER_SCALE))
+
+
+def world_len(v):
+    return max(1, int(v * RENDER_SCALE))
+
+
+def world_rect(rect):
+    return pygame.Rect(world_xy(rect.x, rect.y), (world_len(rect.w), world_len(rect.h)))
+
+
+def world_sprite(surf):
+    # a sprite built in window units, resized for the world surface
+    if RENDER_SCALE == 1:
+        return surf
+    w, h = surf.get_size()
+    return pygame.transform.smoothscale(surf, (world_len(w), world_len(h)))
+
+
+world = None    # the window itself at RENDER_SCALE 1, else an offscreen surface
+
+# Screen shake (Game.screen_shake, px) after taking a hit decays at SHAKE_DECAY px/s
+SHAKE_DECAY = 30
+
+# --- Post-processing
+# Screen-space stages applied to the finished frame, in order, just before
+# it is presented. Each stage works on the whole surface or only on a list
+# of rects (the dirty-rect path); while the F3 profiler is on each stage is
+# timed as its own sub-phase, so further effects can be chained and compared
+# by cost.
+CRT_MODE = 'multiply'     # 'alpha', 'multiply', 'upscale' or 'off'
+CRT_SCANLINE_ALPHA = 45
+CRT_SCANLINE_SPACING = 4
+
+
+class ScanlineStage:
+    name = 'scanlines'
+
+    def __init__(self, mode=None, alpha=None, spacing=None):
+        # None follows CRT_MODE / CRT_SCANLINE_ALPHA / CRT_SCANLINE_SPACING as they are now
+        self.mode_setting = mode
+        self.alpha_setting = alpha
+        self.spacing_setting = spacing
+        self.overlay = None
+        self.overlay_key = None
+        self.strip = None
+
+    @property
+    def mode(self):
+        return CRT_MODE if self.mode_setting is None else self.mode_setting
+
+    @property
+    def alpha(self):
+        return CRT_SCANLINE_ALPHA if self.alpha_setting is None else self.alpha_setting
+
+    @property
+    def spacing(self):
+        return CRT_SCANLINE_SPACING if self.spacing_setting is None else self.spacing_setting
+
+    def enabled(self):
+        return self.mode != 'off' and self.alpha > 0
+
+    def world_space(self):
+        # 'upscale' multiplies the rows into the low-res world before it is
+        # scaled up (the lines thicken with the scale, so they get lighter)
+        return self.mode == 'upscale' and RENDER_SCALE != 1
+
+    def apply(self, surface, rects=None):
+        w, h = surface.get_size()
+        if rects is None:
+            rects = [pygame.Rect(0, 0, w, h)]
+        mode, alpha, spacing = self.mode, self.alpha, self.spacing
+        if self.world_space():
+            alpha = int(alpha * RENDER_SCALE)
+            spacing = max(2, round(spacing * RENDER_SCALE))
+        if mode == 'alpha':
+            # the original look: a full-size SRCALPHA overlay of black lines
+            if self.overlay_key != (w, h, alpha, spacing):
+                self.overlay_key = (w, h, alpha, spacing)
+                self.overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+                for y in range(0, h, spacing):
+                    pygame.draw.line(self.overlay, (0, 0, 0, alpha), (0, y), (w, y))
+            for r in rects:
+                surface.blit(self.overlay, r, r)
+        else:
+            # multiply just the scanline rows by a 1 px grey strip; the shade
+            # matches SDL's alpha blend of black at the same alpha
+            shade = min(255, 256 - alpha)
+            if self.strip is None or self.strip.get_width() != w or self.strip.get_at((0, 0))[0] != shade:
+                self.strip = alloc_tracker.note(pygame.Surface((w, 1)).convert())
+                self.strip.fill((shade, shade, shade))
+            seq = []
+            for r in rects:
+                area = pygame.Rect(0, 0, r.w, 1)
+                first = -(-r.top // spacing) * spacing
+                for y in range(first, r.bottom, spacing):
+                    seq.append((self.strip, (r.x, y), area, pygame.BLEND_RGB_MULT))
+            surface.blits(seq, doreturn=False)
+
+
+class PostProcess:
+    def __init__(self, stages=()):
+        self.stages = list(stages)
+
+    def apply(self, surface, rects=None, world_space=False):
+        # world_space=True runs the stages that belong before the upscale
+        for stage in self.stages:
+            if stage.world_space() != world_space or not stage.enabled():
+                continue
+            if not profiler.enabled:
+                stage.apply(surface, rects)
+                continue
+            start = time.perf_counter()
+            stage.apply(surface, rects)
+            profiler.detail(stage.name, time.perf_counter() - start)
+
+
+post = PostProcess([ScanlineStage()])
+
+# --- Dirty-rect rendering
+# Optional present path for software-rendered displays. The world is drawn
+# into an offscreen frame; each entity marks the screen tiles it covers and
+# only tiles touched this frame or the previous one are restored from the
+# background, copied to the display (then post-processed) and passed to
+# display.update(). The background is captured on full redraws, so the
+# starfield holds still while this path is on. Whole-screen effects force a
+# full redraw.
+DIRTY_RECTS = False
+DIRTY_TILE = 32
+
+
+class DirtyRenderer:
+    def __init__(self, width, height, tile=DIRTY_TILE):
+        self.width = width
+        self.height = height
+        self.tile = tile
+        self.cols = -(-width // tile)
+        self.rows = -(-height // tile)
+        self.cur = np.zeros((self.rows, self.cols), dtype=bool)
+        self.prev = np.ones_like(self.cur)
+        self.bounds = pygame.Rect(0, 0, width, height)
+        self.frame = None
+        self.background = None
+        self.full = True
+
+    def invalidate(self):
+        # something drew over the display directly; next frame redraws it all
+        self.full = True
+
+    def begin(self, force_full=False):
+        # returns the surface to draw the world on this frame
+        if self.frame is None:
+            self.frame = alloc_tracker.note(pygame.Surface((self.width, self.height)).convert())
+            self.background = alloc_tracker.note(self.frame.copy())
+        self.full = self.full or force_full
+        if not self.full:
+            for r in self.rects(self.prev):
+                self.frame.blit(self.background, r, r)
+        self.cur[:] = False
+        return self.frame
+
+    def capture_background(self):
+        self.background.blit(self.frame, (0, 0))
+
+    def add(self, rect):
+        x, y, w, h = rect
+        t = self.tile
+        c0, c1 = max(0, x // t), min(self.cols, -(-(x + w) // t))
+        r0, r1 = max(0, y // t), min(self.rows, -(-(y + h) // t))
+        if c0 < c1 and r0 < r1:
+            self.cur[r0:r1, c0:c1] = True
+
+    def add_boxes(self, x, y, w, h):
+        # add() for arrays of small boxes (w, h may be scalars)
+        x = np.asarray(x, dtype=np.int64)
+        y = np.asarray(y, dtype=np.int64)
+        if x.size == 0:
+            return
+        right, bottom = x + w, y + h
+        on = (right > 0) & (x < self.width) & (bottom > 0) & (y < self.height)
+        if not on.any():
+            return
+        t = self.tile
+        c0 = np.clip(x[on], 0, self.width - 1) // t
+        c1 = np.clip(np.broadcast_to(right, x.shape)[on] - 1, 0, self.width - 1) // t
+        r0 = np.clip(y[on], 0, self.height - 1) // t
+        r1 = np.clip(np.broadcast_to(bottom, y.shape)[on] - 1, 0, self.height - 1) // t
+        for dr in range(int((r1 - r0).max()) + 1):
+            rows = np.minimum(r0 + dr, r1)
+            for dc in range(int((c1 - c0).max()) + 1):
+                self.cur[rows, np.minimum(c0 + dc, c1)] = True
+
+    def rects(self, mask):
+        # merge marked tiles into row runs, stacking identical runs vertically
+        t = self.tile
+        out = []
+        above = {}
+        for r, row in enumerate(mask):
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], row.view(np.int8), [0]))))
+            runs = {}
+            for c0, c1 in edges.reshape(-1, 2).tolist():
+                rect = above.get((c0, c1))
+                if rect is None:
+                    rect = pygame.Rect(c0 * t, r * t, (c1 - c0) * t, t)
+                    out.append(rect)
+                else:
+                    rect.h += t
+                runs[c0, c1] = rect
+            above = runs
+        return [r.clip(self.bounds) for r in out]
+
+    def present(self, display, post):
+        if self.full:
+            display.blit(self.frame, (0, 0))
+            post.apply(display)
+            pygame.display.update()
+            # untracked pixels may remain anywhere: restore everything next frame
+            self.cur[:] = True
+        else:
+            rects = self.rects(self.prev | self.cur)
+            for r in rects:
+                display.blit(self.frame, r, r)
+            post.apply(display, rects)
+            pygame.display.update(rects)
+        self.prev, self.cur = self.cur, self.prev
+        self.full = False
 
-# Screen shake magnitude (frames) used after taking a hit
-screen_shake = 0
 
-# --- CRT overlay (scanlines)
-crt_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-for y in range(0, HEIGHT, 4):
-    pygame.draw.line(crt_surface, (0, 0, 0, 45), (0, y), (WIDTH, y))
+renderer = DirtyRenderer(WIDTH, HEIGHT)
 
 # --- Palette
 BLACK_SPACE = (5, 5, 20)
@@ -64,63 +348,280 @@ class PowerUpType(Enum):
     CUTTER = 6           # newly added cutter power-up
     ARTILLERY = 7        # newly added artillery power-up
 
-# --- Particle system
-class Particle:
-    def __init__(self, x, y, vx, vy, lifetime=30, color=(0, 255, 255)):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.lifetime = lifetime
-        self.age = 0
-        self.color = color
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.age += 1
-        return self.age < self.lifetime
-
-    def draw(self, surface):
-        alpha = max(0, int(255 * (1 - self.age / self.lifetime)))
-        size = max(1, int(3 * (1 - self.age / self.lifetime)))
-        surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        draw_color = (self.color[0], self.color[1], self.color[2], alpha)
-        pygame.draw.circle(surf, draw_color, (size, size), size)
-        surface.blit(surf, (int(self.x) - size, int(self.y) - size))
+# --- Sprite cache
+# Bounded LRU of pre-rendered surfaces. build(key) rasterizes a sprite on a
+# miss; the result is converted to the display format once and reused.
+class SpriteCache:
+    def __init__(self, build, max_size=256):
+        self.build = build
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        self._items.clear()
+
+    def get(self, key):
+        surf = self._items.get(key)
+        if surf is not None:
+            self._items.move_to_end(key)
+            return surf
+        surf = alloc_tracker.note(self.build(key).convert_alpha())
+        self._items[key] = surf
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return surf
 
 
-particles = []
+# --- Particle system
+# Structure-of-arrays pool: every live particle occupies one row in the
+# preallocated arrays below, so spawning, integration and culling are all
+# batched NumPy operations instead of per-object Python calls.
+MAX_PARTICLES = 32768
+
+
+def _sample(rng, value, n):
+    # value is a scalar, a per-particle array, or a (low, high) range sampled uniformly n times;
+    # arrays are cut to n when a nearly full pool takes only part of the burst
+    if isinstance(value, tuple):
+        return rng.uniform(value[0], value[1], n)
+    if isinstance(value, np.ndarray):
+        return value[:n]
+    return value
+
+
+class ParticleSystem:
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, vx, vy, lifetime=1.0, color=(0, 255, 255)):
+        # single particle (same arguments the old Particle class took)
+        i = self.count
+        if i >= self.capacity:
+            return
+        self.pos[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.age[i] = 0
+        self.lifetime[i] = lifetime
+        self.color[i] = color
+        self.count = i + 1
+
+    def burst(self, n, x, y, vx, vy, lifetime=1.0, color=(0, 255, 255)):
+        # n particles at once; x, y, vx, vy (px/s) are scalars or (low, high) ranges
+        start = self.count
+        n = min(n, self.capacity - start)
+        if n <= 0:
+            return
+        end = start + n
+        rng = self.rng
+        self.pos[start:end, 0] = _sample(rng, x, n)
+        self.pos[start:end, 1] = _sample(rng, y, n)
+        self.vel[start:end, 0] = _sample(rng, vx, n)
+        self.vel[start:end, 1] = _sample(rng, vy, n)
+        self.age[start:end] = 0
+        self.lifetime[start:end] = lifetime
+        self.color[start:end] = color
+        self.count = end
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.age[:n] += dt
+        alive = self.age[:n] < self.lifetime[:n]
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        # compact survivors to the front of every array in one sweep
+        for arr in (self.pos, self.vel, self.age, self.lifetime, self.color):
+            arr[:live] = arr[:n][alive]
+        self.count = live
+
+    def submit(self, queue, lag=0.0):
+        # lag: seconds the render time trails the last sim step (for interpolation)
+        n = self.count
+        if n == 0:
+            return
+        fade = 1 - self.age[:n] / self.lifetime[:n]
+        alphas = np.maximum(0, (255 * fade).astype(np.int32))
+        sizes = np.maximum(1, (3 * RENDER_SCALE * fade).astype(np.int32))
+        buckets = alphas * PARTICLE_ALPHA_BUCKETS // 256
+        rgb = self.color[:n].astype(np.int64)
+        keys = (rgb[:, 0] << 24) | (rgb[:, 1] << 16) | (rgb[:, 2] << 8) | (sizes << 4) | buckets
+        # one cache lookup per distinct (color, size, alpha) instead of per particle
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        sprites = [particle_sprites.get(k) for k in uniq.tolist()]
+        pos = (self.pos[:n] - self.vel[:n] * lag) * RENDER_SCALE
+        xs = pos[:, 0].astype(np.int32) - sizes
+        ys = pos[:, 1].astype(np.int32) - sizes
+        on = queue.visible(xs, ys, sizes * 2, sizes * 2)
+        queue.extend(LAYER_PARTICLES, [(sprites[j], (x, y)) for j, x, y in zip(inverse[on].tolist(), xs[on].tolist(), ys[on].tolist())])
+
+
+def _build_particle_sprite(key):
+    # key packs (r, g, b, size, alpha bucket) as built in ParticleSystem.submit
+    r, g, b = (key >> 24) & 255, (key >> 16) & 255, (key >> 8) & 255
+    size, bucket = (key >> 4) & 15, key & 15
+    alpha = bucket * 255 // (PARTICLE_ALPHA_BUCKETS - 1)
+    surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (r, g, b, alpha), (size, size), size)
+    return surf
+
+
+PARTICLE_ALPHA_BUCKETS = 16
+particle_sprites = SpriteCache(_build_particle_sprite, max_size=512)
 
 # --- Shockwaves
+# A ring that grows 120 px/s while fading 300 alpha/s. Its look depends only
+# on its age, so the animation is pre-rendered once (SHOCKWAVE_FPS frames a
+# second, 26 in all) into the sprite atlas and every live shockwave is one
+# queued blit of its frame.
+SHOCKWAVE_LIFETIME = 255 / 300
+SHOCKWAVE_FPS = 30
+SHOCKWAVE_FRAMES = math.ceil(SHOCKWAVE_LIFETIME * SHOCKWAVE_FPS)
+
+
+def shockwave_art():
+    art = {}
+    for k in range(SHOCKWAVE_FRAMES):
+        age = k / SHOCKWAVE_FPS
+        radius = (1 + 120 * age) * RENDER_SCALE
+        alpha = int(255 - 300 * age)
+        size = int(radius * 2 + 6)
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (255, 255, 255, alpha), (size // 2, size // 2), int(radius), world_len(3))
+        art['shockwave', k] = surf
+    return art
+
+
 class Shockwave:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.radius = 1
-        self.alpha = 255
+        self.age = 0.0
 
-    def update(self):
-        self.radius += 4
-        self.alpha -= 10
-        return self.alpha > 0
+    def update(self, dt):
+        self.age += dt
+        return self.age < SHOCKWAVE_LIFETIME
 
-    def draw(self, surface):
-        if self.alpha <= 0:
-            return
-        size = int(self.radius * 2 + 6)
-        surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (255, 255, 255, max(0, self.alpha)), (size // 2, size // 2), int(self.radius), 3)
-        surface.blit(surf, (int(self.x) - size // 2, int(self.y) - size // 2))
 
-
-shockwaves = []
+def submit_shockwaves(queue, waves):
+    last = SHOCKWAVE_FRAMES - 1
+    for sw in waves:
+        queue.submit_centered(LAYER_SHOCKWAVES, ('shockwave', min(round(sw.age * SHOCKWAVE_FPS), last)), *world_xy(sw.x, sw.y))
 
 # --- Background starfield
+# Stars are rendered once into a tiling layer per speed band and the layers
+# are scrolled with one blits() call each, so the per-frame cost does not
+# depend on NUM_STARS. A layer is a loop of horizontal strips (each its own
+# RLE colorkey surface); a strip that scrolls off the bottom is re-rolled
+# with fresh random x positions while hidden, which keeps the old "respawn
+# at a random x" look without re-encoding the whole layer. Stars draw from
+# the starfield's own random.Random, never the game's.
 NUM_STARS = 80
-stars = []
-for _ in range(NUM_STARS):
-    stars.append([random.randint(0, WIDTH), random.randint(0, HEIGHT), random.choice([1, 2]), random.uniform(0.5, 1.8)])
+STAR_LAYER_SPEEDS = (18, 34.5, 51)     # px/s, one layer per band
+STAR_STRIP_HEIGHT = 50
+STAR_COLORKEY = (0, 0, 0)              # never produced by stars blended over BLACK_SPACE
+
+
+class StarLayer:
+    def __init__(self, width, height, count, speed, rng, strip_height=STAR_STRIP_HEIGHT):
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.rng = rng
+        self.strip_height = strip_height
+        # one spare strip so a strip leaving the bottom is hidden before it wraps
+        self.strip_count = -(-height // strip_height) + 1
+        self.layer_height = self.strip_count * strip_height
+        self.stars_per_strip = count * strip_height / height
+        self.offset = 0.0
+        self.strips = []
+        for _ in range(self.strip_count):
+            strip = alloc_tracker.note(pygame.Surface((width, strip_height)).convert())
+            strip.set_colorkey(STAR_COLORKEY, pygame.RLEACCEL)
+            self.strips.append(strip)
+        for k in range(self.strip_count):
+            self.reroll_strip(k)
+
+    def reroll_strip(self, k):
+        strip = self.strips[k]
+        strip.fill(STAR_COLORKEY)
+        # carry the fractional part so low densities still average out
+        rng = self.rng
+        n = int(self.stars_per_strip + rng.random())
+        # hold the lock so SDL re-encodes the RLE strip once, not per circle
+        strip.lock()
+        for _ in range(n):
+            size = rng.choice([1, 2])
+            glow_size = world_len(size + 3)
+            x = rng.randint(0, self.width)
+            y = rng.randint(glow_size, self.strip_height - glow_size)
+            color = WHITE if size == 1 else (180, 230, 255)
+            # glow halo pre-blended over the background (old per-star alpha of 40)
+            glow = tuple(bg + (c - bg) * 40 // 255 for c, bg in zip(color, BLACK_SPACE))
+            pygame.draw.circle(strip, glow, (x, y), glow_size)
+            pygame.draw.circle(strip, color, (x, y), world_len(size))
+        strip.unlock()
+
+    def update(self, dt):
+        old = self.offset
+        step = self.speed * dt
+        for k in range(self.strip_count):
+            top = (k * self.strip_height + old) % self.layer_height
+            if top < self.height <= top + step:
+                self.reroll_strip(k)
+        self.offset = (old + step) % self.layer_height
+
+    def draw(self, surface, lag=0.0):
+        off = int(self.offset - self.speed * lag) % self.layer_height
+        seq = []
+        for k, strip in enumerate(self.strips):
+            top = (k * self.strip_height + off) % self.layer_height
+            if top < self.height:
+                seq.append((strip, (0, top)))
+            elif top > self.layer_height - self.strip_height:
+                seq.append((strip, (0, top - self.layer_height)))
+        surface.blits(seq, doreturn=False)
+
+
+class Starfield:
+    def __init__(self, width, height, count=NUM_STARS, speeds=STAR_LAYER_SPEEDS, rng=None):
+        self.rng = random.Random() if rng is None else rng
+        per_layer = count / len(speeds)
+        self.layers = [StarLayer(width, height, per_layer, speed, self.rng) for speed in speeds]
+
+    def update(self, dt):
+        for layer in self.layers:
+            layer.update(dt)
+
+    def draw(self, surface, lag=0.0):
+        for layer in self.layers:
+            layer.draw(surface, lag)
+
+
+def new_starfield(rng=None):
+    # a starfield sized and paced for the world surface
+    return Starfield(*world.get_size(), count=NUM_STARS, speeds=[v * RENDER_SCALE for v in STAR_LAYER_SPEEDS], rng=rng)
+
+
+starfield = None    # built by init_display()
 
 # --- Audio helpers
 
@@ -150,279 +651,648 @@ plasma_sound = None
 overdrive_sound = None
 bg_music_file = None
 artillery_sound = None
-support_drone = None
-support_drone_missiles = []
 drone_shoot_sound = None
 
 
-audio_files = [f for f in os.listdir('.') if f.lower().endswith(('.mp3', '.wav', '.ogg'))]
-if audio_files:
-    for f in audio_files:
-        if any(k in f.lower() for k in ('background', 'bg', 'music', 'ambient')):
-            bg_music_file = f
-            break
-    if not bg_music_file:
-        bg_music_file = audio_files[0]
-
+def init_audio():
+    # open the mixer, start any background music in the working directory
+    # and map the other audio files to sound effects by name
+    global shoot_sound, hit_sound, powerup_sound, rapid_fire_sound, shield_sound, warp_sound
+    global orbital_sound, plasma_sound, overdrive_sound, bg_music_file, artillery_sound, drone_shoot_sound
     try:
-        pygame.mixer.music.load(bg_music_file)
-        pygame.mixer.music.set_volume(0.25)
-        pygame.mixer.music.play(-1)
+        pygame.mixer.init()
     except Exception:
-        bg_music_file = None
+        pass  # allow running without audio device
 
-    def pick_file(keywords, exclude=None):
+    audio_files = [f for f in os.listdir('.') if f.lower().endswith(('.mp3', '.wav', '.ogg'))]
+    if audio_files:
         for f in audio_files:
-            if exclude and f == exclude:
-                continue
-            lname = f.lower()
-            if any(k in lname for k in keywords):
-                return f
-        return None
+            if any(k in f.lower() for k in ('background', 'bg', 'music', 'ambient')):
+                bg_music_file = f
+                break
+        if not bg_music_file:
+            bg_music_file = audio_files[0]
 
-    shoot_candidate = pick_file(('laser', 'shoot', 'gun', 'pew', 'zap'))
-    hit_candidate = pick_file(('hit', 'explode', 'explosion', 'boom', 'impact'), exclude=bg_music_file)
-    powerup_candidate = pick_file(('powerup', 'power', 'pickup', 'collect', 'ping'), exclude=bg_music_file)
-    rapid_candidate = pick_file(('burst', 'rapid', 'auto', 'blip'), exclude=bg_music_file)
-    orbital_candidate = pick_file(('orbital', 'orb', 'satellite', 'deploy', 'launch'), exclude=bg_music_file)
-    plasma_candidate = pick_file(('plasma', 'blast', 'blaster', 'wave'), exclude=bg_music_file)
-    overdrive_candidate = pick_file(('overdrive',), exclude=bg_music_file)
-    artillery_candidate = pick_file(('artillery', 'shell', 'bomb', 'strike'), exclude=bg_music_file)
-    drone_candidate = pick_file(('drone', 'mini', 'tiny', 'plink', 'tink', 'ping'))
-
-    if drone_candidate:
-        drone_shoot_sound = load_sound(drone_candidate)
-    if not shoot_candidate:
-        shoot_candidate = pick_file(('laser', 'shoot', 'gun')) or (audio_files[0] if audio_files else None)
-    if not hit_candidate:
-        hit_candidate = pick_file(('explode', 'hit'))
-    if not powerup_candidate:
-        powerup_candidate = pick_file(('powerup', 'pickup', 'ping'))
-        shield_candidate = pick_file(('shield', 'sheild'), exclude=bg_music_file)
-        warp_candidate = pick_file(('warp', 'invinc', 'invulnerability'), exclude=bg_music_file)
-    if not rapid_candidate:
-        rapid_candidate = pick_file(('burst', 'rapid'))
+        try:
+            pygame.mixer.music.load(bg_music_file)
+            pygame.mixer.music.set_volume(0.25)
+            pygame.mixer.music.play(-1)
+        except Exception:
+            bg_music_file = None
+
+        def pick_file(keywords, exclude=None):
+            for f in audio_files:
+                if exclude and f == exclude:
+                    continue
+                lname = f.lower()
+                if any(k in lname for k in keywords):
+                    return f
+            return None
+
+        shoot_candidate = pick_file(('laser', 'shoot', 'gun', 'pew', 'zap'))
+        hit_candidate = pick_file(('hit', 'explode', 'explosion', 'boom', 'impact'), exclude=bg_music_file)
+        powerup_candidate = pick_file(('powerup', 'power', 'pickup', 'collect', 'ping'), exclude=bg_music_file)
+        rapid_candidate = pick_file(('burst', 'rapid', 'auto', 'blip'), exclude=bg_music_file)
+        orbital_candidate = pick_file(('orbital', 'orb', 'satellite', 'deploy', 'launch'), exclude=bg_music_file)
+        plasma_candidate = pick_file(('plasma', 'blast', 'blaster', 'wave'), exclude=bg_music_file)
+        overdrive_candidate = pick_file(('overdrive',), exclude=bg_music_file)
+        artillery_candidate = pick_file(('artillery', 'shell', 'bomb', 'strike'), exclude=bg_music_file)
+        drone_candidate = pick_file(('drone', 'mini', 'tiny', 'plink', 'tink', 'ping'))
+
+        if drone_candidate:
+            drone_shoot_sound = load_sound(drone_candidate)
+        if not shoot_candidate:
+            shoot_candidate = pick_file(('laser', 'shoot', 'gun')) or (audio_files[0] if audio_files else None)
+        if not hit_candidate:
+            hit_candidate = pick_file(('explode', 'hit'))
+        if not powerup_candidate:
+            powerup_candidate = pick_file(('powerup', 'pickup', 'ping'))
+            shield_candidate = pick_file(('shield', 'sheild'), exclude=bg_music_file)
+            warp_candidate = pick_file(('warp', 'invinc', 'invulnerability'), exclude=bg_music_file)
+        if not rapid_candidate:
+            rapid_candidate = pick_file(('burst', 'rapid'))
     
-    if shoot_candidate:
-        shoot_sound = load_sound(shoot_candidate)
-    if hit_candidate:
-        hit_sound = load_sound(hit_candidate)
-    if powerup_candidate:
-        powerup_sound = load_sound(powerup_candidate)
-    if 'shield_candidate' in locals() and shield_candidate:
-        shield_sound = load_sound(shield_candidate)
-    else:
-        shield_sound = None
-    if 'warp_candidate' in locals() and warp_candidate:
-        warp_sound = load_sound(warp_candidate)
-    else:
-        warp_sound = None
-    if rapid_candidate:
-        rapid_fire_sound = load_sound(rapid_candidate)
-    else:
-        rapid_fire_sound = None
-    if orbital_candidate:
-        orbital_sound = load_sound(orbital_candidate)
-    else:
-        orbital_sound = None
-    if plasma_candidate:
-        plasma_sound = load_sound(plasma_candidate)
-    else:
-        plasma_sound = None
-    if overdrive_candidate:
-        overdrive_sound = load_sound(overdrive_candidate)
-    else:
-        overdrive_sound = None
-    # Load explosion sound manually
-    if artillery_candidate:
-        artillery_sound = load_sound("strike.mp3")
-    else:
-        artillery_sound = None
+        if shoot_candidate:
+            shoot_sound = load_sound(shoot_candidate)
+        if hit_candidate:
+            hit_sound = load_sound(hit_candidate)
+        if powerup_candidate:
+            powerup_sound = load_sound(powerup_candidate)
+        if 'shield_candidate' in locals() and shield_candidate:
+            shield_sound = load_sound(shield_candidate)
+        else:
+            shield_sound = None
+        if 'warp_candidate' in locals() and warp_candidate:
+            warp_sound = load_sound(warp_candidate)
+        else:
+            warp_sound = None
+        if rapid_candidate:
+            rapid_fire_sound = load_sound(rapid_candidate)
+        else:
+            rapid_fire_sound = None
+        if orbital_candidate:
+            orbital_sound = load_sound(orbital_candidate)
+        else:
+            orbital_sound = None
+        if plasma_candidate:
+            plasma_sound = load_sound(plasma_candidate)
+        else:
+            plasma_sound = None
+        if overdrive_candidate:
+            overdrive_sound = load_sound(overdrive_candidate)
+        else:
+            overdrive_sound = None
+        # Load explosion sound manually
+        if artillery_candidate:
+            artillery_sound = load_sound("strike.mp3")
+        else:
+            artillery_sound = None
 
 # --- High score persistence
 SCORE_FILE = "highscore.json"
 
 
-def load_high_score():
-    if os.path.exists(SCORE_FILE):
+def load_high_score(path=SCORE_FILE):
+    if os.path.exists(path):
         try:
-            with open(SCORE_FILE, 'r') as f:
+            with open(path, 'r') as f:
                 return json.load(f).get('high_score', 0)
         except Exception:
             return 0
     return 0
 
 
-def save_high_score(score):
-    with open(SCORE_FILE, 'w') as f:
+def save_high_score(score, path=SCORE_FILE):
+    with open(path, 'w') as f:
         json.dump({'high_score': score}, f)
 
-# --- Player state
+# --- Player tuning (the player's state lives on Game)
 player_size = 50
-player = pygame.Rect(WIDTH // 2, HEIGHT - player_size - 10, player_size, player_size)
-player_speed = 7
+player_speed = 210            # px/s
+RAPID_FIRE_INTERVAL = 0.1     # seconds between rapid-fire shots
 
-player_shield = False
-player_shield_time = 0
-
-player_invincible = False
-player_invincible_time = 0
-
-rapid_fire = False
-rapid_fire_time = 0
-rapid_fire_counter = 0
-
-orbital_count = 0
-orbital_charging = False
 orbital_charge_duration = 12.0
-orbital_charge_time = 0.0
-orbital_beam_active = False
 orbital_beam_duration = 2.0
-orbital_beam_time = 0.0
 orbital_beam_width = 80
 
-# --- Plasma globals
-plasma_active = False
-plasma_radius = 0.0
+# --- Plasma tuning
 plasma_max_radius = 160.0
-plasma_expand_speed = 14.0
-plasma_hits = set()
+plasma_expand_speed = 420.0   # px/s
 
 # --- Overdrive system (with cooldown + aura)
-overdrive_points = 0
-overdrive_ready = False
-overdrive_active = False
-overdrive_timer = 0.0
 overdrive_cooldown = 8.0
-overdrive_on_cooldown = False
-overdrive_cd_timer = 0.0
 
-# --- Cutter (orbiting blades) globals (NEW)
-cutter_active = False
-cutter_active_time = 0.0        # spin duration remaining (seconds)
+# --- Cutter (orbiting blades) tuning (NEW)
 cutter_spin_duration = 5.0     # user requested 5 seconds
 cutter_spin_radius = 72        # orbit radius while spinning
 cutter_blade_count = 4
-cutter_blades = []             # list of CutterBlade instances
-blade_launch_speed = 9.0       # speed when blades fling outward
+blade_launch_speed = 270.0     # px/s when blades fling outward
 blade_size = 12                # visual size for blades
 blade_explosion_radius = 72    # big explosion radius on impact (kills enemies)
 
-# --- Artillery globals (NEW)
-artillery_available = 0        # number of artillery charges the player has
-artillery_targeting = False    # true while the game is frozen and player picks a target
-artillery_pending = False      # true after target picked, countdown until impact
-artillery_target_pos = (0, 0)
+# --- Artillery tuning (NEW)
 artillery_drop_delay = 0.5     # user requested 0.5s delay after click
-artillery_drop_timer = 0.0
 artillery_radius = 240         # user requested HUGE radius (240 px)
 artillery_activation_key = pygame.K_r
-# Hack globals (experimental feature)
-hack_mode = False
-hacked_enemy = None
-hack_available = True
+# --- Spatial index
+# Uniform grid over object rects. Each object is bucketed in every cell its
+# rect overlaps. build() re-buckets a whole population from coordinate
+# arrays in one vectorized pass; insert()/remove() patch single objects
+# between rebuilds.
+class SpatialGrid:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> list of objects
+
+    def clear(self):
+        self.cells.clear()
+
+    def span_of(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def insert(self, obj):
+        x0, y0, x1, y1 = self.span_of(obj.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(obj)
+
+    def remove(self, obj):
+        x0, y0, x1, y1 = self.span_of(obj.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket and obj in bucket:
+                    bucket.remove(obj)
+
+    def build(self, objs, left, top, right, bottom):
+        # left/top/right/bottom: integer arrays aligned with objs (right/bottom exclusive)
+        cs = self.cell_size
+        x0, y0 = left // cs, top // cs
+        x1, y1 = (right - 1) // cs, (bottom - 1) // cs
+        cell_x, cell_y, owner = [], [], []
+        for ox in range(int((x1 - x0).max(initial=0)) + 1):
+            for oy in range(int((y1 - y0).max(initial=0)) + 1):
+                hit = np.flatnonzero((x0 + ox <= x1) & (y0 + oy <= y1))
+                cell_x.append(x0[hit] + ox)
+                cell_y.append(y0[hit] + oy)
+                owner.append(hit)
+        self.cells = {}
+        if not objs:
+            return
+        cell_x, cell_y, owner = np.concatenate(cell_x), np.concatenate(cell_y), np.concatenate(owner)
+        order = np.lexsort((owner, cell_y, cell_x))
+        cell_x, cell_y, owner = cell_x[order], cell_y[order], owner[order]
+        starts = np.flatnonzero(np.r_[True, (np.diff(cell_x) != 0) | (np.diff(cell_y) != 0)])
+        ends = np.r_[starts[1:], len(owner)].tolist()
+        members = [objs[i] for i in owner.tolist()]
+        keys = zip(cell_x[starts].tolist(), cell_y[starts].tolist())
+        self.cells = {key: members[a:b] for key, a, b in zip(keys, starts.tolist(), ends)}
+
+    def candidates(self, rect):
+        x0, y0, x1, y1 = self.span_of(rect)
+        if x0 == x1 and y0 == y1:
+            return list(self.cells.get((x0, y0), ()))
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(dict.fromkeys(bucket))
+        return list(found)
+
+    def query_rect(self, rect):
+        # objects whose rect collides with rect
+        return [obj for obj in self.candidates(rect) if rect.colliderect(obj.rect)]
+
+    def query_point(self, x, y):
+        cs = self.cell_size
+        bucket = self.cells.get((int(x) // cs, int(y) // cs), ())
+        return [obj for obj in bucket if obj.rect.collidepoint(x, y)]
+
+
+# --- Area-of-effect
+# Shape tests evaluated over every enemy center at once (EnemyStore.centers()).
+# Each returns the indices of the enemies inside.
+def aoe_circle(centers, x, y, radius):
+    d2 = (centers[:, 0] - x) ** 2 + (centers[:, 1] - y) ** 2
+    return np.flatnonzero(d2 <= radius * radius)
+
+
+def aoe_cone(centers, apex_x, bottom_y, top_y, width_bottom, width_top):
+    # upward trapezoid: width_bottom wide at bottom_y, widening to width_top at top_y
+    cy = centers[:, 1]
+    inside = (cy >= top_y) & (cy <= bottom_y)
+    progress = 1 - (cy - top_y) / (bottom_y - top_y)
+    half = (width_bottom + (width_top - width_bottom) * progress) / 2
+    inside &= np.abs(centers[:, 0] - apex_x) <= half
+    return np.flatnonzero(inside)
+
+
 # --- Enemy entity
+ENEMY_SIZE = 40
+ENEMY_FADE_STEPS = 8    # pre-rendered fade-in alpha levels per enemy type
+
+
+def render_enemy(enemy_type, alpha, w=ENEMY_SIZE, h=ENEMY_SIZE):
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    if enemy_type == EnemyType.DRONE:
+        pygame.draw.ellipse(surf, (CYAN[0], CYAN[1], CYAN[2], alpha), (0, 0, w, h))
+        pygame.draw.circle(surf, (NEON_GREEN[0], NEON_GREEN[1], NEON_GREEN[2], alpha), (w // 2, h // 2), 6, 2)
+    elif enemy_type == EnemyType.FIGHTER:
+        points = [(w // 2, 0), (w, h // 2), (w // 2, h), (0, h // 2)]
+        pygame.draw.polygon(surf, (NEON_PINK[0], NEON_PINK[1], NEON_PINK[2], alpha), points)
+        pygame.draw.polygon(surf, (255,255,255,alpha//3), points, 2)
+    else:
+        pygame.draw.rect(surf, (NEON_PURPLE[0], NEON_PURPLE[1], NEON_PURPLE[2], alpha), (0, 0, w, h))
+        pygame.draw.circle(surf, (CYAN[0], CYAN[1], CYAN[2], alpha), (w // 2, h // 2), 12, 2)
+    return surf
+
+
+def enemy_art():
+    return {('enemy', t, i): world_sprite(render_enemy(t, i * 255 // (ENEMY_FADE_STEPS - 1)))
+            for t in EnemyType for i in range(ENEMY_FADE_STEPS)}
+
+
+# Movement patterns (stored as integer codes in EnemyStore.pattern)
+PATTERN_STRAIGHT = 0
+PATTERN_ZIGZAG = 1
+PATTERN_DASH = 2
+PATTERN_CIRCLE = 3
+ENEMY_PATTERNS = (PATTERN_STRAIGHT, PATTERN_ZIGZAG, PATTERN_DASH, PATTERN_CIRCLE)
+ENEMY_SPEED_SCALE = np.array([0.0, 1.0, 1.5, 0.7])     # indexed by EnemyType.value
+ENEMY_HEALTH = {EnemyType.DRONE: 1, EnemyType.FIGHTER: 1.5, EnemyType.CAPITAL: 3}
+CIRCLE_PATTERN_RADIUS = 120
+CIRCLE_ANGULAR_SPEED = 2.1     # rad/s
+ZIGZAG_SPEED = 180             # peak sideways px/s
+ENEMY_FADE_IN_RATE = 360       # alpha per second
+
+
 class Enemy:
-    def __init__(self, x, y, enemy_type):
-        self.rect = pygame.Rect(x, y, 40, 40)
+    # View onto one row of an EnemyStore. Render and collision code use it
+    # like the old per-object enemy; the data lives in the store's arrays.
+    # Once removed, the view keeps a snapshot of its last rect and health.
+    __slots__ = ('store', 'index', 'type', '_rect', '_health')
+
+    def __init__(self, store, index, enemy_type):
+        self.store = store
+        self.index = index
         self.type = enemy_type
-        self.health = 1 if enemy_type == EnemyType.DRONE else (1.5 if enemy_type == EnemyType.FIGHTER else 3)
-        self.alpha = 0
-
-    def draw(self, surface):
-        self.alpha = min(255, self.alpha + 12)
-        surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-
-        if self.type == EnemyType.DRONE:
-            pygame.draw.ellipse(surf, (CYAN[0], CYAN[1], CYAN[2], self.alpha), (0, 0, self.rect.width, self.rect.height))
-            pygame.draw.circle(surf, (NEON_GREEN[0], NEON_GREEN[1], NEON_GREEN[2], self.alpha), (self.rect.width // 2, self.rect.height // 2), 6, 2)
-        elif self.type == EnemyType.FIGHTER:
-            points = [(self.rect.width // 2, 0), (self.rect.width, self.rect.height // 2), (self.rect.width // 2, self.rect.height), (0, self.rect.height // 2)]
-            pygame.draw.polygon(surf, (NEON_PINK[0], NEON_PINK[1], NEON_PINK[2], self.alpha), points)
-            pygame.draw.polygon(surf, (255,255,255,self.alpha//3), points, 2)
+        self._rect = None
+        self._health = 0
+
+    @property
+    def alive(self):
+        return self.index >= 0 and not self.store.dead[self.index]
+
+    @property
+    def rect(self):
+        if self.index < 0:
+            return self._rect
+        i = self.index
+        return pygame.Rect(int(self.store.x[i]), int(self.store.y[i]), ENEMY_SIZE, ENEMY_SIZE)
+
+    @property
+    def health(self):
+        return self.store.health[self.index] if self.index >= 0 else self._health
+
+    @health.setter
+    def health(self, value):
+        if self.index >= 0:
+            self.store.health[self.index] = value
+        else:
+            self._health = value
+
+
+class EnemyStore:
+    # Enemy table kept as parallel typed arrays (rows 0..count-1 are live).
+    # Movement patterns advance as batched array operations; views in
+    # self.views (same order as the rows) give Enemy-like access per row.
+    FIELDS = {
+        'x': np.float64, 'y': np.float64, 'type': np.int8, 'health': np.float64,
+        'px': np.float64, 'py': np.float64,   # position at the previous sim step
+        'alpha': np.float32, 'pattern': np.int8, 'timer': np.float64, 'angle': np.float64,
+        'dash_used': np.bool_, 'dash_vy': np.float64, 'circle_done': np.bool_,
+        'dead': np.bool_,   # killed this frame, dropped at the next KillQueue.resolve()
+    }
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+        self.views = []
+        # collision index over the live rows; rebuilt lazily after movement
+        self.grid = SpatialGrid()
+        self.grid_dirty = False
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, i):
+        return self.views[i]
+
+    def __bool__(self):
+        return self.count > 0
+
+    def clear(self):
+        for view in self.views:
+            self._detach(view)
+        self.views = []
+        self.count = 0
+        self.grid.clear()
+        self.grid_dirty = False
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            setattr(self, name, grown)
+
+    def spawn(self, x, y, enemy_type):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.type[i] = enemy_type.value
+        self.health[i] = ENEMY_HEALTH[enemy_type]
+        self.alpha[i] = 0
+        self.pattern[i] = random.choice(ENEMY_PATTERNS)
+        self.timer[i] = 0
+        self.angle[i] = random.uniform(0, math.tau)
+        self.dash_used[i] = False
+        self.dash_vy[i] = 0
+        self.circle_done[i] = False
+        self.dead[i] = False
+        view = Enemy(self, i, enemy_type)
+        self.views.append(view)
+        self.count = i + 1
+        if not self.grid_dirty:
+            self.grid.insert(view)
+        return view
+
+    def _detach(self, view):
+        view._rect = view.rect
+        view._health = view.health
+        view.index = -1
+
+    def remove(self, view):
+        # returns False if the enemy was already removed
+        if view.index < 0:
+            return False
+        self.remove_many((view,))
+        return True
+
+    def remove_many(self, batch):
+        # drop every enemy in batch with one compaction sweep over the arrays
+        keep = np.ones(self.count, dtype=bool)
+        dropped = False
+        for view in batch:
+            if view.index >= 0:
+                keep[view.index] = False
+                if not self.grid_dirty:
+                    self.grid.remove(view)
+                self._detach(view)
+                dropped = True
+        if not dropped:
+            return
+        n = self.count
+        live = int(np.count_nonzero(keep))
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:live] = arr[:n][keep]
+        self.views = [v for v, k in zip(self.views, keep.tolist()) if k]
+        for i, view in enumerate(self.views):
+            view.index = i
+        self.count = live
+
+    def centers(self):
+        n = self.count
+        half = ENEMY_SIZE / 2
+        return np.column_stack((self.x[:n].astype(np.int64) + half, self.y[:n].astype(np.int64) + half))
+
+    def advance(self, dt, base_speed, slowed, px, py, height):
+        # move every enemy one sim step along its pattern (base_speed in px/s)
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        alpha = self.alpha[:n]
+        np.minimum(alpha + ENEMY_FADE_IN_RATE * dt, 255, out=alpha)
+        pattern = self.pattern[:n]
+        if slowed:
+            speed = np.full(n, base_speed * 0.2)
         else:
-            pygame.draw.rect(surf, (NEON_PURPLE[0], NEON_PURPLE[1], NEON_PURPLE[2], self.alpha), (0, 0, self.rect.width, self.rect.height))
-            pygame.draw.circle(surf, (CYAN[0], CYAN[1], CYAN[2], self.alpha), (self.rect.width // 2, self.rect.height // 2), 12, 2)
+            speed = base_speed * ENEMY_SPEED_SCALE[self.type[:n]]
+        self.timer[:n] += dt
+        dy = speed * dt
+
+        zig = pattern == PATTERN_ZIGZAG
+        x[zig] += np.sin(self.timer[:n][zig] * 4) * ZIGZAG_SPEED * dt
+
+        dash = pattern == PATTERN_DASH
+        dash_used = self.dash_used[:n]
+        trigger = dash & ~dash_used & (y + ENEMY_SIZE / 2 > height * 0.33)
+        dash_used |= trigger
+        self.dash_vy[:n][trigger] = speed[trigger] * 4
+        dashing = dash & dash_used
+        dy[dashing] = self.dash_vy[:n][dashing] * dt
+
+        circling = (pattern == PATTERN_CIRCLE) & ~self.circle_done[:n]
+        if circling.any():
+            angle = self.angle[:n]
+            angle[circling] += CIRCLE_ANGULAR_SPEED * dt
+            a = angle[circling]
+            x[circling] = px + np.cos(a) * CIRCLE_PATTERN_RADIUS - ENEMY_SIZE / 2
+            y[circling] = py + np.sin(a) * CIRCLE_PATTERN_RADIUS - ENEMY_SIZE / 2
+            dy[circling] = 0
+            self.circle_done[:n] |= circling & (angle > math.tau)
+        y += dy
+        self.grid_dirty = True
+
+    def _sync_grid(self):
+        if self.grid_dirty:
+            n = self.count
+            left = self.x[:n].astype(np.int64)
+            top = self.y[:n].astype(np.int64)
+            self.grid.build(self.views, left, top, left + ENEMY_SIZE, top + ENEMY_SIZE)
+            self.grid_dirty = False
+
+    def query_rect(self, rect):
+        self._sync_grid()
+        dead = self.dead
+        return [v for v in self.grid.query_rect(rect) if not dead[v.index]]
+
+    def query_point(self, x, y):
+        self._sync_grid()
+        dead = self.dead
+        return [v for v in self.grid.query_point(x, y) if not dead[v.index]]
+
+    def select(self, indices):
+        # live views for row indices (e.g. AoE hits), skipping enemies already killed
+        dead = self.dead
+        return [self.views[i] for i in indices.tolist() if not dead[i]]
+
+    def below(self, height):
+        # enemies whose top edge has left the bottom of the screen
+        n = self.count
+        return [self.views[i] for i in np.flatnonzero(self.y[:n].astype(np.int64) > height).tolist()]
+
+    def overlapping(self, rect):
+        n = self.count
+        left = self.x[:n].astype(np.int64)
+        top = self.y[:n].astype(np.int64)
+        hit = (left < rect.right) & (left + ENEMY_SIZE > rect.left) & (top < rect.bottom) & (top + ENEMY_SIZE > rect.top)
+        hit &= ~self.dead[:n]
+        return [self.views[i] for i in np.flatnonzero(hit).tolist()]
+
+    def submit(self, queue, t=1.0):
+        # t: interpolation fraction between the previous and current sim step
+        n = self.count
+        if n == 0:
+            return
+        kinds = [[atlas.area(('enemy', k, i)) for i in range(ENEMY_FADE_STEPS)] for k in EnemyType]
+        px, py = self.px[:n], self.py[:n]
+        xs = ((px + (self.x[:n] - px) * t) * RENDER_SCALE).astype(np.int64)
+        ys = ((py + (self.y[:n] - py) * t) * RENDER_SCALE).astype(np.int64)
+        on = queue.visible(xs, ys, kinds[0][0].w, kinds[0][0].h)
+        steps = (self.alpha[:n][on].astype(np.int64) * (ENEMY_FADE_STEPS - 1) // 255).tolist()
+        types = (self.type[:n][on] - 1).tolist()
+        sheet = atlas.surface
+        queue.extend(LAYER_ENEMIES, [(sheet, (x, y), kinds[k][st]) for k, st, x, y in zip(types, steps, xs[on].tolist(), ys[on].tolist())])
+
+
+# --- Kill resolution
+# Damage sites push kills here instead of removing enemies inline. The queue
+# marks an enemy dead on its first push (later pushes the same frame are
+# ignored) and resolve() applies every kill in one pass per frame: one
+# compaction of the enemy store, score and overdrive totals, batched
+# particle effects and power-up drops.
+ENEMY_SCORE = {EnemyType.DRONE: 1, EnemyType.FIGHTER: 2, EnemyType.CAPITAL: 3}
+POWERUP_DROP_WEIGHTS = {
+    PowerUpType.SHIELD: 80, PowerUpType.RAPID_FIRE: 60, PowerUpType.INVINCIBILITY: 40,
+    PowerUpType.ORBITAL: 8, PowerUpType.PLASMA: 80, PowerUpType.CUTTER: 12, PowerUpType.ARTILLERY: 12,
+}
+
+
+class KillQueue:
+    def __init__(self, store):
+        self.store = store
+        self.events = []
+
+    def clear(self):
+        self.events.clear()
+
+    def push(self, enemy, points=None, overdrive=0.0, drop=False, fx=None):
+        # points=None scores the enemy's type; points=0 just removes it.
+        # fx is an optional (count, speed, color) particle burst at the enemy.
+        if not enemy.alive:
+            return False
+        self.store.dead[enemy.index] = True
+        if points is None:
+            points = ENEMY_SCORE[enemy.type]
+        self.events.append((enemy, points, overdrive, drop, fx))
+        return True
+
+    def resolve(self, particle_system, drops):
+        # returns (score gained, overdrive points gained)
+        events = self.events
+        if not events:
+            return 0, 0.0
+        self.events = []
+        # removed views keep their last rect, so centers stay readable below
+        self.store.remove_many([e[0] for e in events])
+        gained = sum(e[1] for e in events)
+        overdrive = sum(e[2] for e in events)
+
+        # one burst per distinct effect, covering every kill that uses it
+        by_fx = {}
+        for enemy, _, _, _, fx in events:
+            if fx:
+                by_fx.setdefault(fx, []).append(enemy.rect.center)
+        for (count, speed, color), points in by_fx.items():
+            pts = np.repeat(np.array(points, dtype=np.float64), count, axis=0)
+            particle_system.burst(len(pts), pts[:, 0], pts[:, 1], (-speed, speed), (-speed, speed), color=color)
+
+        dropped = [e[0].rect.center for e in events if e[3]]
+        if dropped:
+            kinds = random.choices(list(POWERUP_DROP_WEIGHTS), weights=list(POWERUP_DROP_WEIGHTS.values()), k=len(dropped))
+            for (cx, cy), kind in zip(dropped, kinds):
+                drops.append(PowerUp(cx, cy, kind))
+        return gained, overdrive
+
 
-        surface.blit(surf, self.rect.topleft)
 # --- Support Drone (friendly auto-shooter)
 class SupportDrone:
-    def __init__(self):
-        self.x = player.centerx
-        self.y = player.centery - 140
+    def __init__(self, game):
+        self.game = game
+        self.x = self.prev_x = self.game.player.centerx
+        self.y = self.prev_y = self.game.player.centery - 140
         self.orbit_offset = 0.0
         self.fire_cooldown = 0.0
         self.fire_delay = 0.45   # shots per second
 
-    def update(self):
-        global score, enemies
+    def update(self, dt):
         # follow player with smooth motion (above the player)
-        target_x = player.centerx + math.cos(self.orbit_offset) * 45
-        target_y = player.centery - 120 + math.sin(self.orbit_offset) * 10
+        target_x = self.game.player.centerx + math.cos(self.orbit_offset) * 45
+        target_y = self.game.player.centery - 120 + math.sin(self.orbit_offset) * 10
 
-        self.x += (target_x - self.x) * 0.15
-        self.y += (target_y - self.y) * 0.15
+        # 15% of the gap per 1/30 s, whatever the step size
+        follow = 1 - 0.85 ** (dt * 30)
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += (target_x - self.x) * follow
+        self.y += (target_y - self.y) * follow
 
 
         # shooting
         if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1 / 30
+            self.fire_cooldown -= dt
         else:
             # find nearest enemy
             closest = None
-            closest_d = 99999
-            for e in enemies:
-                dx = e.rect.centerx - self.x
-                dy = e.rect.centery - self.y
-                d = dx*dx + dy*dy
-                if d < closest_d:
-                    closest_d = d
-                    closest = e
+            if self.game.enemies:
+                centers = self.game.enemies.centers()
+                d = (centers[:, 0] - self.x) ** 2 + (centers[:, 1] - self.y) ** 2
+                i = int(np.argmin(d))
+                if d[i] < 99999:
+                    closest = self.game.enemies[i]
 
             # shoot if enemy exists
             if closest:
-                support_drone_missiles.append(
+                self.game.support_drone_missiles.append(
                     pygame.Rect(int(self.x)-3, int(self.y)-8, 6, 12)
                 )
                 play_sound(drone_shoot_sound or shoot_sound)
                 self.fire_cooldown = self.fire_delay
         # --- Overdrive pulse attack ---
-        if overdrive_active:
+        if self.game.overdrive_active:
             if not hasattr(self, 'pulse_cd'):
                 self.pulse_cd = 0.0
 
             if self.pulse_cd > 0:
-                self.pulse_cd -= 1 / 30
+                self.pulse_cd -= dt
             else:
                 # radius of the pulse
                 pulse_radius = 140
 
                 # visual burst
-                for _ in range(30):
-                    particles.append(
-                        Particle(
-                            self.x + random.uniform(-10,10),
-                            self.y + random.uniform(-10,10),
-                            random.uniform(-4,4),
-                            random.uniform(-4,4),
-                            lifetime=20,
-                            color=(150, 220, 255)
-                        )
-                    )
+                self.game.particles.burst(30, (self.x - 10, self.x + 10), (self.y - 10, self.y + 10), (-120, 120), (-120, 120), lifetime=0.67, color=(150, 220, 255))
 
                 # shockwave ring
-                shockwaves.append(Shockwave(int(self.x), int(self.y)))
+                self.game.shockwaves.append(Shockwave(int(self.x), int(self.y)))
 
                 # damage enemies in range
-                for e in enemies[:]:
-                    dx = e.rect.centerx - self.x
-                    dy = e.rect.centery - self.y
-                    if dx*dx + dy*dy <= pulse_radius * pulse_radius:
-                        try:
-                            enemies.remove(e)
-                        except ValueError:
-                            pass
-                        score += 1 if e.type == EnemyType.DRONE else (2 if e.type == EnemyType.FIGHTER else 3)
+                hits = aoe_circle(self.game.enemies.centers(), self.x, self.y, pulse_radius)
+                for e in self.game.enemies.select(hits):
+                    self.game.kills.push(e)
 
                 # optional sound
                 play_sound(drone_shoot_sound or shoot_sound)
@@ -431,16 +1301,19 @@ class SupportDrone:
                 self.pulse_cd = 0.1 # 0.1 seconds between pulses  
 
 
-    def draw(self, surface):
-        # glowing friendly drone
-        pygame.draw.circle(surface, (255, 80, 80), (int(self.x), int(self.y)), 12)
-        pygame.draw.circle(surface, (255, 160, 160), (int(self.x), int(self.y)), 16, 2)
+    def submit(self, queue, t=1.0):
+        pos = world_xy(self.prev_x + (self.x - self.prev_x) * t, self.prev_y + (self.y - self.prev_y) * t)
+        queue.submit_centered(LAYER_DRONE, 'support_drone', *pos)
 
 
+def drone_art():
+    # glowing friendly drone
+    r = world_len(16)
+    surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (255, 80, 80), (r + 1, r + 1), world_len(12))
+    pygame.draw.circle(surf, (255, 160, 160), (r + 1, r + 1), r, world_len(2))
+    return {'support_drone': surf}
 
-enemies = []
-enemy_speed = 4
-spawn_rate = 25
 
 # --- Power-ups
 class PowerUp:
@@ -481,57 +1354,199 @@ class PowerUp:
             pygame.draw.line(surface, WHITE, (cx, cy - 6), (cx, cy + 6), 1)
 
 
-powerups = []
+POWERUP_SPRITE_MARGIN = 3   # icon rings overhang the 20x20 rect
+
+
+def powerup_art():
+    art = {}
+    m = POWERUP_SPRITE_MARGIN
+    for power_type in PowerUpType:
+        surf = pygame.Surface((20 + 2 * m, 20 + 2 * m), pygame.SRCALPHA)
+        PowerUp(m, m, power_type).draw(surf)
+        art['powerup', power_type] = world_sprite(surf)
+    return art
+
 
 # --- Missiles
-missiles = []
-missile_speed = 8
+missile_speed = 240           # px/s
+DRONE_MISSILE_SPEED = 300
+
+# Pre-built projectile sprites: core glow + comet tail (+ twin beams in
+# overdrive) composed once into the atlas, so every bullet is a single blit.
+MISSILE_TAIL_LENGTH = 18
+MISSILE_SPRITE_OFFSET = (-1, -6)   # sprite topleft relative to missile rect topleft
+DRONE_MISSILE_COLOR = (80, 200, 255)
+
+
+def render_missile(bullet_color, overdrive):
+    ox, oy = -MISSILE_SPRITE_OFFSET[0], -MISSILE_SPRITE_OFFSET[1]
+    surf = pygame.Surface((12, 20 + oy + 2), pygame.SRCALPHA)
+    cx, cy = 5 + ox, 10 + oy   # missile rect center in sprite space
+
+    # Core glow
+    pygame.draw.circle(surf, bullet_color, (cx, cy), 3)
+
+    # Tail: short comet streak
+    tail_length = MISSILE_TAIL_LENGTH
+    tail_surf = pygame.Surface((6, tail_length), pygame.SRCALPHA)
+    for i in range(tail_length):
+        alpha = max(0, 200 - int((i / tail_length) * 180))
+        pygame.draw.line(tail_surf, (bullet_color[0], bullet_color[1], bullet_color[2], alpha), (3, tail_length), (3, tail_length - i), 3 - i // 8)
+    surf.blit(tail_surf, (cx - 3, cy - tail_length // 2))
+
+    # Overdrive twin-beam visual
+    if overdrive:
+        pygame.draw.line(surf, CYAN, (cx - 3, 20 + oy), (cx - 3, 0), 2)
+        pygame.draw.line(surf, CYAN, (cx + 3, 20 + oy), (cx + 3, 0), 2)
+    return surf
+
+
+def projectile_art():
+    drone_surf = pygame.Surface((world_len(6), world_len(12)), pygame.SRCALPHA)
+    drone_surf.fill(DRONE_MISSILE_COLOR)
+    return {'missile': world_sprite(render_missile(NEON_GREEN, False)),
+            'missile_overdrive': world_sprite(render_missile(CYAN, True)),
+            'drone_missile': drone_surf}
+
+
+def submit_projectiles(queue, player_missiles, drone_missiles, overdrive, lag=0.0):
+    # player + support drone missiles; lag (seconds behind the last sim step)
+    # backs each missile up along its straight-up path
+    name = 'missile_overdrive' if overdrive else 'missile'
+    ox, oy = MISSILE_SPRITE_OFFSET
+    oy += int(missile_speed * lag)
+    for m in player_missiles:
+        queue.submit(LAYER_PROJECTILES, name, *world_xy(m.x + ox, m.y + oy))
+    dy = int(DRONE_MISSILE_SPEED * lag)
+    for m in drone_missiles:
+        queue.submit(LAYER_PROJECTILES, 'drone_missile', *world_xy(m.x, m.y + dy))
+
 
 # --- Score + UI
-score = 0
-high_score = load_high_score()
-lives = 3
-try:
-    font = pygame.font.Font("space age.ttf", 24)
-    large_font = pygame.font.Font("space age.ttf", 48)
-    small_font = pygame.font.Font("space age.ttf", 16)
-except Exception:
-    font = pygame.font.SysFont(None, 24)
-    large_font = pygame.font.SysFont(None, 48)
-    small_font = pygame.font.SysFont(None, 16)
+font = large_font = small_font = None   # loaded by init_display()
 
 clock = pygame.time.Clock()
 
+# --- HUD
+def render_text(text_font, text, color):
+    # every text surface goes through here so allocation tracking sees it
+    return alloc_tracker.note(text_font.render(text, True, color))
+
+
+# Rendered text comes from a bounded cache keyed by (font, text, color). Each
+# HUD panel is composed into one layer that is rebuilt only when the strings
+# it shows change, so a timer shown at .1f re-renders at most 10 times a
+# second and a static score not at all.
+hud_text = SpriteCache(lambda key: render_text(*key), max_size=128)
+
+
+class HudPanel:
+    def __init__(self):
+        self.entries = None
+        self.layer = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def update(self, entries):
+        # entries: tuple of (font, text, color, (x, y)) in screen coordinates
+        if entries == self.entries:
+            return
+        self.entries = entries
+        if not entries:
+            self.layer = None
+            return
+        placed = [(hud_text.get((f, text, color)), pos) for f, text, color, pos in entries]
+        rects = [surf.get_rect(topleft=pos) for surf, pos in placed]
+        self.rect = rects[0].unionall(rects[1:])
+        self.layer = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for surf, (x, y) in placed:
+            # entries don't overlap, so MAX onto the clear layer copies the text
+            # pixels exactly (a normal alpha blit would darken the edges twice)
+            self.layer.blit(surf, (x - self.rect.x, y - self.rect.y), special_flags=pygame.BLEND_RGBA_MAX)
+
+    def draw(self, surface):
+        if self.layer is None:
+            return None
+        return surface.blit(self.layer, self.rect)
+
+
+hud_left = HudPanel()
+hud_right = HudPanel()
+
+
+def draw_hud(surface, game):
+    # returns the rects drawn (for the dirty-rect path)
+    left = [(font, f"SCORE: {game.score}", NEON_GREEN, (10, 10))]
+    if game.player_shield:
+        left.append((small_font, f"SHIELD: {game.player_shield_time:.1f}s", SHIELD_COLOR, (10, 40)))
+    if game.rapid_fire:
+        left.append((small_font, f"BURST: {game.rapid_fire_time:.1f}s", NEON_GREEN, (10, 60)))
+    if game.player_invincible:
+        left.append((small_font, f"WARP: {game.player_invincible_time:.1f}s", NEON_PINK, (10, 80)))
+    if game.orbital_charging:
+        left.append((small_font, f"CHARGING: {game.orbital_charge_time:.1f}s", (255, 200, 50), (10, 100)))
+    # Cutter timers
+    if game.cutter_active:
+        left.append((small_font, f"CUTTER ACTIVE: {game.cutter_active_time:.1f}s", (180, 220, 255), (10, 120)))
+    # Overdrive UI & cooldown
+    if game.overdrive_ready:
+        left.append((small_font, "OVERDRIVE READY", CYAN, (10, 160)))
+    if game.overdrive_active:
+        left.append((small_font, f"OVERDRIVE: {game.overdrive_timer:.1f}s", CYAN, (10, 180)))
+    if game.overdrive_on_cooldown:
+        left.append((small_font, f"OVR CD: {game.overdrive_cd_timer:.1f}s", (180, 180, 255), (10, 200)))
+    # Artillery
+    left.append((small_font, f"ARTILLERY: {game.artillery_available}", (255, 200, 80), (10, 220)))
+    # hack mode cue
+    if game.hacked_enemy:
+        left.append((small_font, "HACK MODE — OVERDRIVE LOCKED", RED, (10, 240)))
+    hud_left.update(tuple(left))
+    hud_right.update((
+        (font, f"SHIPS: {game.lives}", RED, (WIDTH - 180, 10)),
+        (small_font, f"HIGH: {game.high_score}", CYAN, (WIDTH - 180, 40)),
+    ))
+    return [r for r in (hud_left.draw(surface), hud_right.draw(surface)) if r]
+
 # --- Game states
 PLAYING = 0
 GAME_OVER = 1
 PAUSED = 2
 
-game_state = PLAYING
+# --- CutterBlade class (NEW)
+# Blades are drawn from pre-rotated sprites (BLADE_ROTATION_STEPS angles,
+# packed into the atlas) instead of a transform.rotate per blade per frame.
+BLADE_ROTATION_STEPS = 64
+
+
+def blade_art():
+    size = world_len(blade_size)
+    surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    pts = [(size, 0), (size*2 - 2, size), (2, size)]
+    pygame.draw.polygon(surf, (200, 220, 255, 220), pts)
+    pygame.draw.polygon(surf, (255,255,255,80), pts, 1)
+    return {('blade', i): pygame.transform.rotate(surf, i * 360 / BLADE_ROTATION_STEPS)
+            for i in range(BLADE_ROTATION_STEPS)}
 
-# --- Helper
-def spawn_thruster():
-    for _ in range(2):
-        particles.append(Particle(player.centerx + random.randint(-6, 6), player.bottom + random.randint(0, 4), random.uniform(-0.8, 0.8), random.uniform(1.8, 3.2), lifetime=18, color=(150, 200, 255)))
 
-# --- CutterBlade class (NEW)
 class CutterBlade:
-    def __init__(self, angle, radius=cutter_spin_radius):
+    def __init__(self, anchor, angle, radius=cutter_spin_radius):
+        self.anchor = anchor      # rect orbited while spinning (the player)
         self.angle = angle        # current angle (radians)
         self.radius = radius      # orbit radius while spinning
         self.state = 'orbit'      # 'orbit' or 'launched'
-        self.x = player.centerx + math.cos(self.angle) * self.radius
-        self.y = player.centery + math.sin(self.angle) * self.radius
+        self.x = self.prev_x = anchor.centerx + math.cos(self.angle) * self.radius
+        self.y = self.prev_y = anchor.centery + math.sin(self.angle) * self.radius
+        self.prev_angle = angle
         self.vx = 0.0
         self.vy = 0.0
         self.size = blade_size
         self.rect = pygame.Rect(int(self.x - self.size//2), int(self.y - self.size//2), self.size, self.size)
 
-    def update_orbit(self, spin_speed=0.16):
-        # spin_speed is radians per frame (approx for 30 fps)
-        self.angle += spin_speed
-        self.x = player.centerx + math.cos(self.angle) * self.radius
-        self.y = player.centery + math.sin(self.angle) * self.radius
+    def update_orbit(self, dt, spin_speed=4.8):
+        # spin_speed is radians per second
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
+        self.angle += spin_speed * dt
+        self.x = self.anchor.centerx + math.cos(self.angle) * self.radius
+        self.y = self.anchor.centery + math.sin(self.angle) * self.radius
         self.rect.center = (int(self.x), int(self.y))
 
     def launch(self):
@@ -540,228 +1555,987 @@ class CutterBlade:
         self.vx = math.cos(self.angle) * blade_launch_speed
         self.vy = math.sin(self.angle) * blade_launch_speed
 
-    def update_launched(self):
-        self.x += self.vx
-        self.y += self.vy
+    def update_launched(self, dt):
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
+        self.x += self.vx * dt
+        self.y += self.vy * dt
         self.rect.center = (int(self.x), int(self.y))
 
-    def draw(self, surface):
-        # draw a small rotating shard / blade with simple triangle
-        surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pts = [(self.size, 0), (self.size*2 - 2, self.size), (2, self.size)]
-        pygame.draw.polygon(surf, (200, 220, 255, 220), pts)
-        pygame.draw.polygon(surf, (255,255,255,80), pts, 1)
-        rot = pygame.transform.rotate(surf, (self.angle * 180 / math.pi) % 360)
-        rrect = rot.get_rect(center=(int(self.x), int(self.y)))
-        surface.blit(rot, rrect.topleft)
+    def submit(self, queue, t=1.0):
+        # small rotating shard / blade: nearest pre-rotated frame
+        angle = self.prev_angle + (self.angle - self.prev_angle) * t
+        step = round(angle / math.tau * BLADE_ROTATION_STEPS) % BLADE_ROTATION_STEPS
+        pos = world_xy(self.prev_x + (self.x - self.prev_x) * t, self.prev_y + (self.y - self.prev_y) * t)
+        queue.submit_centered(LAYER_BLADES, ('blade', step), *pos)
+
+
+# --- Sprite atlas + render queue
+# All fixed art (enemy fade frames, power-up icons, projectiles, blade
+# rotations, shockwave frames, the support drone) is packed into one atlas
+# surface when the game starts. Draw code doesn't blit: it submits (sprite,
+# position, blend flags) entries to a layer of the render queue, which culls
+# anything off the world surface and flushes each layer with one blits()
+# call. One-off art (particles, effect caches) goes through the same queue.
+ATLAS_WIDTH = 1024
+ATLAS_ART = (enemy_art, powerup_art, projectile_art, blade_art, shockwave_art, drone_art)
+
+# Layers flush in this order; the player is drawn directly between
+# LAYER_SHOCKWAVES and LAYER_ENEMIES.
+(LAYER_PARTICLES, LAYER_SHOCKWAVES, LAYER_ENEMIES, LAYER_POWERUPS, LAYER_EFFECTS,
+ LAYER_PROJECTILES, LAYER_BLADES, LAYER_DRONE, LAYER_AURA) = range(9)
+RENDER_LAYERS = 9
+
+
+class SpriteAtlas:
+    def __init__(self, builders, width=ATLAS_WIDTH):
+        self.builders = builders
+        self.width = width
+        self.surface = None
+        self.areas = {}
+
+    def build(self):
+        # convert_alpha() needs the display, so this runs once it exists
+        art = {}
+        for build in self.builders:
+            art.update(build())
+        # shelf packing, tallest sprites first
+        x = y = shelf = 0
+        for name in sorted(art, key=lambda n: art[n].get_height(), reverse=True):
+            w, h = art[name].get_size()
+            if x + w > self.width:
+                x, y, shelf = 0, y + shelf, 0
+            self.areas[name] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf = max(shelf, h)
+        sheet = pygame.Surface((self.width, y + shelf), pygame.SRCALPHA)
+        for name, area in self.areas.items():
+            # MAX onto the cleared sheet copies the pixels, alpha included
+            sheet.blit(art[name], area, special_flags=pygame.BLEND_RGBA_MAX)
+        self.surface = alloc_tracker.note(sheet.convert_alpha())
+
+    def area(self, name):
+        if self.surface is None:
+            self.build()
+        return self.areas[name]
+
+
+class RenderQueue:
+    def __init__(self, width, height, layers=RENDER_LAYERS):
+        self.width = width
+        self.height = height
+        self.layers = [[] for _ in range(layers)]
+
+    def visible(self, x, y, w, h):
+        # mask of the boxes (arrays) that overlap the target surface
+        return (x < self.width) & (y < self.height) & (x + w > 0) & (y + h > 0)
+
+    def submit(self, layer, name, x, y, flags=0):
+        # atlas sprite with its top-left corner at (x, y)
+        area = atlas.area(name)
+        if x < self.width and y < self.height and x + area.w > 0 and y + area.h > 0:
+            self.layers[layer].append((atlas.surface, (x, y), area, flags))
+
+    def submit_centered(self, layer, name, x, y, flags=0):
+        area = atlas.area(name)
+        self.submit(layer, name, x - area.w // 2, y - area.h // 2, flags)
+
+    def submit_surface(self, layer, surf, x, y, flags=0):
+        # art that isn't in the atlas
+        w, h = surf.get_size()
+        if x < self.width and y < self.height and x + w > 0 and y + h > 0:
+            self.layers[layer].append((surf, (x, y), None, flags))
+
+    def extend(self, layer, entries):
+        # ready-made blits() entries, already culled by the caller
+        self.layers[layer].extend(entries)
+
+    def flush(self, surface, dirty=None, through=RENDER_LAYERS - 1):
+        # draw (and empty) every layer up to and including `through`
+        for entries in self.layers[:through + 1]:
+            if not entries:
+                continue
+            if dirty is None:
+                surface.blits(entries, doreturn=False)
+            else:
+                boxes = np.array(surface.blits(entries))
+                dirty.add_boxes(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+            entries.clear()
+
+
+atlas = SpriteAtlas(ATLAS_ART)
+render_queue = None     # sized to the world surface by init_display()
+
+
+# --- Effect sprites
+# Plasma ring, orbital cone and overdrive aura are pre-rendered shapes
+# blitted straight onto the world instead of full-screen SRCALPHA layers
+# allocated and cleared every frame. Sizes are in world pixels.
+PLASMA_RING_BUCKET = 4          # ring radii are rounded to this many px
+ORBITAL_CONE_BOTTOM = 40        # cone width at the ship
+ORBITAL_CONE_STEPS = 16         # cone heights are rounded up by at most 1/16
+EFFECT_PAD = 3                  # room for outlines past the shape's edges
+
+
+def _build_plasma_ring(radius):
+    size = radius * 2 + 2
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    c = (radius + 1, radius + 1)
+    pygame.draw.circle(surf, (0, 255, 255, 180), c, radius, world_len(6))
+    pygame.draw.circle(surf, (200, 255, 255, 80), c, max(1, int(radius * 0.65)), world_len(2))
+    return surf
+
+
+def orbital_cone_height(top):
+    # sprite height for a cone whose foot is at world y=top: top rounded up
+    # in steps of about top / ORBITAL_CONE_STEPS, so a ship moving up and
+    # down reuses a few sprites while the full-width edge stays at or just
+    # above the screen top
+    step = max(1, top // ORBITAL_CONE_STEPS)
+    return max(1, -(-top // step) * step)
+
+
+def _build_orbital_cone(height):
+    # trapezoid from the full world width at the top to the beam's foot
+    half_top = world_len(WIDTH) // 2
+    half_bottom = world_len(ORBITAL_CONE_BOTTOM) // 2
+    cx = half_top + EFFECT_PAD
+    surf = pygame.Surface((cx * 2, height + EFFECT_PAD * 2), pygame.SRCALPHA)
+    points = [(cx - half_bottom, height + EFFECT_PAD), (cx + half_bottom, height + EFFECT_PAD), (cx + half_top, EFFECT_PAD), (cx - half_top, EFFECT_PAD)]
+    pygame.draw.polygon(surf, (255, 255, 255, 200), points)
+    pygame.draw.polygon(surf, (200, 200, 255, 120), points, world_len(3))
+    return surf
+
+
+def _build_overdrive_aura(_):
+    half = world_len(100)
+    surf = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (255, 60, 60, 160), (half, half), world_len(90), world_len(6))
+    return surf
+
+
+plasma_rings = SpriteCache(_build_plasma_ring, max_size=48)
+orbital_cones = SpriteCache(_build_orbital_cone, max_size=8)
+overdrive_auras = SpriteCache(_build_overdrive_aura, max_size=1)
+
+
+# --- Frame profiler
+# F3 toggles per-phase timing. Game.update() and draw_window() call
+# profiler.lap(phase) as each phase finishes; the time since the previous
+# lap (or mark()) is charged to that phase, summed over the frame and kept in
+# a ring buffer of the last PROFILE_HISTORY frames. Sub-phases (post-process
+# stages) are reported with detail(); they are shown under the phase that
+# contains them and not added to the totals. While off, lap() is a single
+# flag test, so the scopes cost nothing measurable.
+PROFILE_PHASES = (
+    # update
+    "player", "enemies", "aoe", "pickups", "missiles", "particles", "kills", "starfield",
+    # draw
+    "stars", "fx", "entities", "upscale", "hud", "present",
+)
+PROFILE_INDEX = {name: i for i, name in enumerate(PROFILE_PHASES)}
+PROFILE_UPDATE_PHASES = 8           # the first 8 phases belong to the update
+PROFILE_HISTORY = 240               # frames kept per phase
+PROFILE_REFRESH = 15                # overlay text/graph rebuilt every N frames
+PROFILE_GRAPH_MS = 50.0             # top of the frame-time graph
+PROFILER_KEY = pygame.K_F3
+
+
+class FrameProfiler:
+    def __init__(self, history=PROFILE_HISTORY):
+        self.enabled = False
+        self.history = history
+        self.samples = np.zeros((len(PROFILE_PHASES), history), dtype=np.float32)  # ms
+        self.frame_ms = np.zeros(history, dtype=np.float32)
+        self.current = [0.0] * len(PROFILE_PHASES)   # seconds, this frame
+        self.details = {}                             # sub-phase -> ms ring
+        self.details_current = {}                     # sub-phase -> seconds, this frame
+        self.cursor = 0
+        self.filled = 0
+        self.last = 0.0
+        self.panel = None
+        self.panel_age = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.samples[:] = 0
+        self.frame_ms[:] = 0
+        self.current = [0.0] * len(PROFILE_PHASES)
+        self.details = {}
+        self.details_current = {}
+        self.cursor = self.filled = 0
+        self.panel = None
+        self.last = time.perf_counter()
+
+    def mark(self):
+        # start timing from here without charging anything
+        if self.enabled:
+            self.last = time.perf_counter()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[PROFILE_INDEX[phase]] += now - self.last
+        self.last = now
 
+    def detail(self, name, seconds):
+        # time spent in a sub-phase this frame (measured by the caller)
+        self.details_current[name] = self.details_current.get(name, 0.0) + seconds
 
-# --- Draw frame
-def draw_window():
-    global screen_shake, plasma_active, plasma_radius
-    global overdrive_ready, overdrive_active, overdrive_timer, overdrive_on_cooldown, overdrive_cd_timer
-
-    shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
-    shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+    def end_frame(self, frame_time):
+        # frame_time: seconds since the previous frame (what the graph shows)
+        if not self.enabled:
+            return
+        i = self.cursor
+        self.samples[:, i] = self.current
+        self.samples[:, i] *= 1000
+        self.frame_ms[i] = frame_time * 1000
+        self.current = [0.0] * len(PROFILE_PHASES)
+        for name in self.details_current.keys() - self.details.keys():
+            self.details[name] = np.zeros(self.history, dtype=np.float32)
+        for name, ring in self.details.items():
+            ring[i] = self.details_current.get(name, 0.0) * 1000
+        self.details_current.clear()
+        self.cursor = (i + 1) % self.history
+        self.filled = min(self.filled + 1, self.history)
+
+    def averages(self):
+        # per-phase mean and max (ms) over the recorded frames
+        window = self.samples[:, :self.filled] if self.filled < self.history else self.samples
+        if window.shape[1] == 0:
+            return np.zeros(len(PROFILE_PHASES)), np.zeros(len(PROFILE_PHASES))
+        return window.mean(axis=1), window.max(axis=1)
+
+    def recent_frames(self):
+        # frame times oldest first
+        if self.filled < self.history:
+            return self.frame_ms[:self.filled]
+        return np.roll(self.frame_ms, -self.cursor)
+
+    def draw(self, surface, game):
+        # bottom-right panel: per-phase avg/max ms, entity counts and a
+        # frame-time graph; returns the area drawn
+        self.panel_age -= 1
+        if self.panel is None or self.panel_age <= 0:
+            self.panel = self.build_panel(game)
+            self.panel_age = PROFILE_REFRESH
+        return surface.blit(self.panel, self.panel.get_rect(bottomright=(WIDTH - 10, HEIGHT - 10)))
+
+    def build_panel(self, game):
+        mean, peak = self.averages()
+        update_ms = float(mean[:PROFILE_UPDATE_PHASES].sum())
+        draw_ms = float(mean[PROFILE_UPDATE_PHASES:].sum())
+        # rows of (text, color) cells laid out in fixed columns
+        rows = [(("ms", WHITE), ("avg", WHITE), ("max", WHITE)),
+                (("update", NEON_GREEN), (f"{update_ms:.2f}", NEON_GREEN), ("", WHITE)),
+                (("draw", CYAN), (f"{draw_ms:.2f}", CYAN), ("", WHITE))]
+        for i, name in enumerate(PROFILE_PHASES):
+            color = NEON_GREEN if i < PROFILE_UPDATE_PHASES else CYAN
+            rows.append(((name, color), (f"{mean[i]:.2f}", WHITE), (f"{peak[i]:.2f}", WHITE)))
+        for name, ring in sorted(self.details.items()):
+            window = ring[:self.filled]
+            if len(window):
+                rows.append(((f"  {name}", (140, 160, 200)), (f"{window.mean():.2f}", WHITE), (f"{window.max():.2f}", WHITE)))
+        rows.append((("enemies", WHITE), (str(len(game.enemies)), WHITE), ("", WHITE)))
+        rows.append((("particles", WHITE), (str(len(game.particles)), WHITE), ("", WHITE)))
+        rows.append((("missiles", WHITE), (str(len(game.missiles)), WHITE), ("", WHITE)))
+        rows.append((("powerups", WHITE), (str(len(game.powerups)), WHITE), ("", WHITE)))
+        rows.append((("shockwaves", WHITE), (str(len(game.shockwaves)), WHITE), ("", WHITE)))
+        columns = (8, 160, 230)
+        line_h = small_font.get_linesize()
+        graph_h = 50
+        width = 300
+        height = line_h * len(rows) + graph_h + 20
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for n, row in enumerate(rows):
+            for x, (text, color) in zip(columns, row):
+                if text:
+                    panel.blit(render_text(small_font, text, color), (x, 6 + n * line_h))
+
+        # frame-time graph, newest on the right; the line marks the sim budget
+        graph = pygame.Rect(8, height - graph_h - 8, width - 16, graph_h)
+        pygame.draw.rect(panel, (60, 60, 80), graph, 1)
+        budget_y = graph.bottom - int(graph_h * min(1.0, SIM_DT * 1000 / PROFILE_GRAPH_MS))
+        pygame.draw.line(panel, (120, 60, 60), (graph.left, budget_y), (graph.right - 1, budget_y))
+        frames = self.recent_frames()
+        if len(frames) > 1:
+            xs = graph.right - 1 - (len(frames) - 1 - np.arange(len(frames))) * (graph.width - 1) / (self.history - 1)
+            ys = graph.bottom - 1 - np.minimum(frames / PROFILE_GRAPH_MS, 1.0) * (graph_h - 2)
+            pygame.draw.lines(panel, NEON_GREEN, False, np.column_stack((xs, ys)).tolist())
+        return panel
+
+
+profiler = FrameProfiler()
+
+
+# --- Spike capture
+# Opt-in (SPIKE_CAPTURE). A frame slower than SPIKE_BUDGET_MS starts cProfile for the next
+# SPIKE_CAPTURE_FRAMES frames. The profile (.prof, for pstats/snakeviz) and a
+# JSON snapshot of the game at the spike (entity counts, active power-ups,
+# difficulty, the top functions of the profile) go to SPIKE_DIR, which keeps
+# the newest SPIKE_KEEP captures. Writing a capture is itself a hitch, so
+# detection rests for SPIKE_COOLDOWN seconds afterwards. A capture that can't
+# be saved warns once and turns capture off.
+SPIKE_CAPTURE = False
+SPIKE_BUDGET_MS = 100.0     # 0 disables capture
+SPIKE_CAPTURE_FRAMES = 5
+SPIKE_COOLDOWN = 5.0
+SPIKE_DIR = "spikes"
+SPIKE_KEEP = 20
+SPIKE_TOP_FUNCTIONS = 25
+# Game attributes recorded as on/off (spike snapshots, telemetry bitmask)
+EFFECT_FLAGS = (
+    "player_shield", "player_invincible", "rapid_fire", "orbital_charging", "orbital_beam_active",
+    "plasma_active", "overdrive_active", "overdrive_on_cooldown", "cutter_active",
+    "artillery_targeting", "artillery_pending", "hack_mode", "hacked_enemy", "support_drone",
+)
+
+
+def spike_snapshot(game, frame_time):
+    snapshot = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "frame_ms": round(frame_time * 1000, 2),
+        "state": game.state,
+        "score": game.score,
+        "lives": game.lives,
+        "enemy_speed": game.enemy_speed,
+        "spawn_rate": round(game.spawn_rate, 3),
+        "counts": {
+            "enemies": len(game.enemies),
+            "particles": len(game.particles),
+            "missiles": len(game.missiles),
+            "powerups": len(game.powerups),
+            "shockwaves": len(game.shockwaves),
+            "cutter_blades": len(game.cutter_blades),
+            "drone_missiles": len(game.support_drone_missiles),
+        },
+        "flags": {name: bool(getattr(game, name)) for name in EFFECT_FLAGS},
+    }
+    if profiler.enabled and profiler.filled:
+        # the spiking frame's phase breakdown, when F3 timing is on
+        last = profiler.samples[:, profiler.cursor - 1]
+        snapshot["phases_ms"] = {name: round(float(ms), 3) for name, ms in zip(PROFILE_PHASES, last)}
+    return snapshot
+
+
+class SpikeCapture:
+    def __init__(self, budget_ms=None, frames=SPIKE_CAPTURE_FRAMES, directory=SPIKE_DIR, keep=SPIKE_KEEP):
+        self.budget_ms = budget_ms  # None follows SPIKE_BUDGET_MS as it is now
+        self.frames = frames
+        self.directory = directory
+        self.keep = keep
+        self.profile = None
+        self.remaining = 0
+        self.snapshot = None
+        self.frame_ms = []          # frame times while profiling
+        self.resume_at = 0.0        # perf_counter() time detection restarts
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self.resume_at = 0.0
+
+    @property
+    def budget(self):
+        return SPIKE_BUDGET_MS if self.budget_ms is None else self.budget_ms
+
+    def end_frame(self, game, frame_time):
+        # call once per rendered frame with the time it took (seconds)
+        if not self.active:
+            return
+        if self.profile is not None:
+            self.frame_ms.append(round(frame_time * 1000, 2))
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.finish()
+            return
+        budget = self.budget
+        if not budget or frame_time * 1000 <= budget:
+            return
+        if time.perf_counter() < self.resume_at:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler (e.g. python -m cProfile) owns the hook
+            return
+        self.profile = profile
+        self.remaining = self.frames
+        self.snapshot = spike_snapshot(game, frame_time)
+        self.frame_ms = []
 
-    screen.fill(BLACK_SPACE)
+    def finish(self):
+        self.profile.disable()
+        try:
+            self.write()
+        except OSError as e:
+            warnings.warn(f"spike capture disabled, not saved: {e}", RuntimeWarning)
+            self.active = False
+        self.profile = None
+        self.snapshot = None
+        self.resume_at = time.perf_counter() + SPIKE_COOLDOWN
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, time.strftime("spike-%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}")
+        self.profile.dump_stats(stem + ".prof")
+        stats = pstats.Stats(self.profile).stats
+        top = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:SPIKE_TOP_FUNCTIONS]
+        self.snapshot["budget_ms"] = self.budget
+        self.snapshot["profiled_frames_ms"] = self.frame_ms
+        self.snapshot["top_cumulative"] = [
+            {"function": f"{os.path.basename(file)}:{line}({name})", "calls": calls,
+             "tottime_ms": round(tottime * 1000, 3), "cumtime_ms": round(cumtime * 1000, 3)}
+            for (file, line, name), (_, calls, tottime, cumtime, _) in top
+        ]
+        with open(stem + ".json", "w") as f:
+            json.dump(self.snapshot, f, indent=2)
+        self.rotate()
+
+    def rotate(self):
+        captures = sorted(name[:-5] for name in os.listdir(self.directory) if name.startswith("spike-") and name.endswith(".json"))
+        if not self.keep:
+            return
+        for stem in captures[:-self.keep]:
+            for ext in (".json", ".prof"):
+                try:
+                    os.remove(os.path.join(self.directory, stem + ext))
+                except OSError:
+                    pass
 
-    # Stars
-    for s in stars:
-        s[1] += s[3]
-        if s[1] > HEIGHT:
-            s[1] = 0
-            s[0] = random.randint(0, WIDTH)
-            s[2] = random.choice([1, 2])
-            s[3] = random.uniform(0.5, 1.8)
-        color = WHITE if s[2] == 1 else (180, 230, 255)
-        pygame.draw.circle(screen, color, (int(s[0]), int(s[1])), s[2])
-        glow_size = s[2] + 3
-        glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (color[0], color[1], color[2], 40), (glow_size, glow_size), glow_size)
-        screen.blit(glow_surf, (int(s[0]) - glow_size, int(s[1]) - glow_size))
 
-    # Particles
-    for particle in particles:
-        particle.draw(screen)
-    for sw in shockwaves:
-        sw.draw(screen)
+spike_capture = SpikeCapture()
 
-    # Player
-    if player_invincible and int(player_invincible_time * 10) % 2:
-        pygame.draw.circle(screen, NEON_PINK, (player.centerx, player.centery), 60, 2)
-        pygame.draw.circle(screen, NEON_PINK, (player.centerx, player.centery), 50, 1)
-        pygame.draw.polygon(screen, NEON_PINK, [(player.centerx, player.top + shake_x), (player.right, player.centery + shake_y), (player.centerx, player.bottom + shake_x), (player.left, player.centery + shake_y)])
-        if random.random() < 0.3:
-            particles.append(Particle(player.centerx + random.randint(-40, 40), player.centery + random.randint(-40, 40), random.uniform(-2, 2), random.uniform(-2, 2), lifetime=20, color=NEON_PINK))
-    else:
-        pygame.draw.polygon(screen, RED, [(player.centerx, player.top + shake_x), (player.right, player.centery + shake_y), (player.centerx, player.bottom + shake_x), (player.left, player.centery + shake_y)])
 
-    if player_shield:
-        pygame.draw.circle(screen, SHIELD_COLOR, player.center, 60, 3)
+# --- Allocation accounting
+# Opt-in (ALLOC_TRACKING, or bench.py --alloc). Per frame, tracemalloc's
+# snapshot diff gives the Python memory each source line newly holds, and
+# its peak gives the frame's transient high-water mark (temporaries that were
+# freed again before the frame ended). SDL pixel buffers are invisible to
+# tracemalloc, so surfaces and their pixel bytes are counted per call site:
+# pygame.Surface() and the pygame.transform functions are wrapped while
+# tracking, and the methods that can't be wrapped (convert, convert_alpha,
+# copy, Font.render) report through alloc_tracker.note() / render_text().
+# Tracking slows every frame; the numbers are for comparison only.
+ALLOC_TRACKING = False
+ALLOC_TOP = 10                      # sites listed by report()
+ALLOC_TRANSFORMS = ("scale", "smoothscale", "rotate", "rotozoom", "flip", "scale2x")
 
-    # Orbital cue
-    if orbital_charging and int(orbital_charge_time * 10) % 2:
-        pygame.draw.circle(screen, (255, 200, 50), (player.centerx, player.centery), 70, 3)
-        pygame.draw.circle(screen, (255, 200, 50), (player.centerx, player.centery), 55, 1)
-    # hack mode cue
-    if hacked_enemy:
-        hack_text = small_font.render("HACK MODE — OVERDRIVE LOCKED", True, RED)
-        screen.blit(hack_text, (10, 240))
-    # Enemies & powerups
-    for enemy in enemies:
-        enemy.draw(screen)
-    for powerup in powerups:
-        powerup.draw(screen)
 
-    # Plasma ring
-    if plasma_active:
-        ring_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(ring_surf, (0, 255, 255, 180), player.center, int(plasma_radius), 6)
-        inner = max(1, int(plasma_radius * 0.65))
-        pygame.draw.circle(ring_surf, (200, 255, 255, 80), player.center, inner, 2)
-        screen.blit(ring_surf, (0, 0))
-        if random.random() < 0.6:
-            angle = random.random() * math.tau
-            px = player.centerx + math.cos(angle) * plasma_radius
-            py = player.centery + math.sin(angle) * plasma_radius
-            particles.append(Particle(px, py, random.uniform(-0.8, 0.8), random.uniform(-0.8, 0.8), lifetime=20, color=(0, 255, 255)))
-
-    # Orbital beam
-    if orbital_beam_active:
-        beam_x = player.centerx
-        beam_top = 0
-        beam_bottom = player.top
-        cone_width_bottom = 40
-        cone_width_top = WIDTH
-        cone_points = [(beam_x - cone_width_bottom // 2, beam_bottom), (beam_x + cone_width_bottom // 2, beam_bottom), (beam_x + cone_width_top // 2, beam_top), (beam_x - cone_width_top // 2, beam_top)]
-        beam_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.polygon(beam_surf, (255, 255, 255, 200), cone_points)
-        pygame.draw.polygon(beam_surf, (200, 200, 255, 120), cone_points, 3)
-        screen.blit(beam_surf, (0, 0))
-
-    # Missiles (upgraded visuals)
-    for missile in missiles:
-        # Choose color based on overdrive
-        bullet_color = CYAN if overdrive_active else NEON_GREEN
-
-        # Core glow
-        pygame.draw.circle(screen, bullet_color, missile.center, 3)
-
-        # Tail: short comet streak using an alpha surface
-        tail_length = 18
-        tail_surf = pygame.Surface((6, tail_length), pygame.SRCALPHA)
-        for i in range(tail_length):
-            alpha = max(0, 200 - int((i / tail_length) * 180))
-            pygame.draw.line(tail_surf, (bullet_color[0], bullet_color[1], bullet_color[2], alpha), (3, tail_length), (3, tail_length - i), 3 - i // 8)
-        screen.blit(tail_surf, (missile.centerx - 3, missile.centery - tail_length // 2))
-
-        # Overdrive twin-beam visual
-        if overdrive_active:
-            pygame.draw.line(screen, CYAN, (missile.centerx - 3, missile.bottom), (missile.centerx - 3, missile.top - 6), 2)
-            pygame.draw.line(screen, CYAN, (missile.centerx + 3, missile.bottom), (missile.centerx + 3, missile.top - 6), 2)
+def _alloc_site(filename, lineno):
+    return f"{os.path.basename(filename)}:{lineno}"
 
-    # Cutter blades (draw after player so they appear around the ship)
-    if cutter_blades:
-        for blade in cutter_blades:
-            blade.draw(screen)
-    # Support Drone
-    if support_drone:
-        support_drone.draw(screen)
-    # Draw support drone missiles
-    for m in support_drone_missiles:
-        pygame.draw.rect(screen, (80, 200, 255), m)  # light blue drone bullet
 
-    # HUD
-    score_text = font.render(f"SCORE: {score}", True, NEON_GREEN)
-    lives_text = font.render(f"SHIPS: {lives}", True, RED)
-    high_score_text = small_font.render(f"HIGH: {high_score}", True, CYAN)
-    screen.blit(score_text, (10, 10))
-    screen.blit(lives_text, (WIDTH - 180, 10))
-    screen.blit(high_score_text, (WIDTH - 180, 40))
-
-    if player_shield:
-        shield_text = small_font.render(f"SHIELD: {player_shield_time:.1f}s", True, SHIELD_COLOR)
-        screen.blit(shield_text, (10, 40))
-    if rapid_fire:
-        rapid_text = small_font.render(f"BURST: {rapid_fire_time:.1f}s", True, NEON_GREEN)
-        screen.blit(rapid_text, (10, 60))
-    if player_invincible:
-        inv_text = small_font.render(f"WARP: {player_invincible_time:.1f}s", True, NEON_PINK)
-        screen.blit(inv_text, (10, 80))
-    if orbital_charging:
-        orbital_text = small_font.render(f"CHARGING: {orbital_charge_time:.1f}s", True, (255, 200, 50))
-        screen.blit(orbital_text, (10, 100))
+class AllocationTracker:
+    def __init__(self):
+        self.active = False
+        self.patched = []           # (owner, name, original) to put back
+        self.own_lines = None
+
+    def start(self):
+        self.frames = 0
+        self.sites = {}             # "file:line" -> [blocks, bytes] newly held, all frames
+        self.surfaces = {}          # "file:line" -> [surfaces, pixel bytes], all frames
+        self.transient = []         # per-frame high-water above the frame's start (bytes)
+        self.surface_counts = []    # surfaces created per frame
+        self.frame_surfaces = 0
+        if self.own_lines is None:
+            # the tracker's own bookkeeping is left out of the site table
+            self.own_lines = {line for f in vars(AllocationTracker).values() if hasattr(f, "__code__")
+                              for _, _, line in f.__code__.co_lines() if line}
+        # frames skipped when charging a surface; a sprite cache miss is
+        # charged to whoever asked the cache
+        self.own_codes = {render_text.__code__, SpriteCache.get.__code__, self.note.__code__, self.count_surface.__code__}
+        tracemalloc.start(1)        # one traceback frame: the allocating line
+        try:
+            self.install()
+            self.previous = self.snapshot()
+        except BaseException:
+            # never leave pygame patched by a half-started tracker
+            tracemalloc.stop()
+            self.restore()
+            raise
+        self.base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self.active = True
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        try:
+            tracemalloc.stop()
+        finally:
+            self.restore()
+        self.previous = None
+
+    def restore(self):
+        # undo install(): pygame.Surface and pygame.transform are pygame's again
+        while self.patched:
+            owner, name, original = self.patched.pop()
+            setattr(owner, name, original)
+
+    def close(self):
+        # quitting: print the report, then stop
+        if self.active:
+            print(self.report())
+            self.stop()
+
+    def snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    def install(self):
+        tracker = self
+        real_surface = pygame.Surface
+
+        class CountedSurface(real_surface):
+            def __init__(self, *args, **kwargs):
+                real_surface.__init__(self, *args, **kwargs)
+                tracker.count_surface(self)
+
+        self.own_codes.add(CountedSurface.__init__.__code__)
+        self.patched.append((pygame, "Surface", real_surface))
+        pygame.Surface = CountedSurface
+        for name in ALLOC_TRANSFORMS:
+            original = getattr(pygame.transform, name, None)
+            if original is not None:
+                self.patched.append((pygame.transform, name, original))
+                setattr(pygame.transform, name, self.counted(original))
+
+    def counted(self, func):
+        def wrapper(*args, **kwargs):
+            surf = func(*args, **kwargs)
+            # a dest_surface argument is filled in place, nothing new
+            if not any(surf is a for a in args) and not any(surf is a for a in kwargs.values()):
+                self.count_surface(surf)
+            return surf
+        self.own_codes.add(wrapper.__code__)
+        return wrapper
+
+    def note(self, surf):
+        # a surface made by a method install() can't wrap (convert, copy, ...);
+        # returns it, so calls wrap the expression in place
+        if self.active:
+            self.count_surface(surf)
+        return surf
+
+    def count_surface(self, surf):
+        # charged to the first caller outside the tracker's own wrappers
+        frame = sys._getframe(1)
+        while frame.f_code in self.own_codes:
+            frame = frame.f_back
+        self.frame_surfaces += 1
+        entry = self.surfaces.setdefault(_alloc_site(frame.f_code.co_filename, frame.f_lineno), [0, 0])
+        entry[0] += 1
+        entry[1] += surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def end_frame(self):
+        if not self.active:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        self.transient.append(peak - self.base)
+        self.surface_counts.append(self.frame_surfaces)
+        self.frame_surfaces = 0
+        current = self.snapshot()
+        for stat in current.compare_to(self.previous, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            if frame.filename == __file__ and frame.lineno in self.own_lines:
+                continue
+            entry = self.sites.setdefault(_alloc_site(frame.filename, frame.lineno), [0, 0])
+            entry[0] += max(0, stat.count_diff)
+            entry[1] += stat.size_diff
+        self.previous = current
+        self.frames += 1
+        # the snapshot and diff above are not part of the next frame
+        self.base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def summary(self):
+        # per-frame figures (KiB) for benchmarks and report()
+        frames = max(1, self.frames)
+        transient = np.array(self.transient or [0]) / 1024
+        surfaces = np.array(self.surface_counts or [0])
+        return {
+            "alloc_kb_p50": round(float(np.percentile(transient, 50)), 2),
+            "alloc_kb_p95": round(float(np.percentile(transient, 95)), 2),
+            "held_kb_per_frame": round(sum(b for _, b in self.sites.values()) / 1024 / frames, 3),
+            "surfaces_per_frame": round(float(surfaces.mean()), 3),
+            "surface_kb_per_frame": round(sum(b for _, b in self.surfaces.values()) / 1024 / frames, 2),
+        }
+
+    def report(self, top=ALLOC_TOP):
+        frames = max(1, self.frames)
+        lines = [f"allocations over {self.frames} frames: " + ", ".join(f"{k} {v}" for k, v in self.summary().items())]
+        lines.append("  top sites by memory newly held per frame:")
+        for site, (blocks, size) in sorted(self.sites.items(), key=lambda kv: kv[1][1], reverse=True)[:top]:
+            lines.append(f"    {site:<24}{blocks / frames:9.2f} blocks {size / 1024 / frames:9.3f} KiB")
+        lines.append("  surfaces created per frame:")
+        for site, (count, size) in sorted(self.surfaces.items(), key=lambda kv: kv[1][1], reverse=True)[:top]:
+            lines.append(f"    {site:<24}{count / frames:9.2f} surfs  {size / 1024 / frames:9.3f} KiB")
+        return "\n".join(lines)
+
+
+alloc_tracker = AllocationTracker()
+
+
+# --- Telemetry
+# Opt-in (TELEMETRY). One fixed-layout record per rendered frame
+# (TELEMETRY_DTYPE) goes into a preallocated ring buffer; the main loop only
+# writes fields in place. A background thread copies out what was recorded
+# every TELEMETRY_FLUSH_SECONDS and appends it to a gzip'd binary part file in
+# TELEMETRY_DIR, starting a new part past TELEMETRY_ROTATE_BYTES and keeping
+# the newest TELEMETRY_KEEP parts. Each part starts with TELEMETRY_MAGIC and a
+# JSON header line describing the record layout; telemetry.py reads them
+# back into NumPy arrays. If the writer falls a whole ring behind, the oldest
+# records are dropped rather than blocking the game. Each part's header holds
+# the drops so far; records dropped after the last part started are written
+# into an empty closing part on close(). A write error warns once and turns
+# telemetry off.
+TELEMETRY = False
+TELEMETRY_DIR = "telemetry"
+TELEMETRY_CAPACITY = 4096           # records in the ring (~30 s at 144 fps)
+TELEMETRY_FLUSH_SECONDS = 1.0
+TELEMETRY_ROTATE_BYTES = 8 << 20    # uncompressed record bytes per part
+TELEMETRY_KEEP = 20
+TELEMETRY_MAGIC = b"COPILOT-TELEMETRY 1\n"
+TELEMETRY_DTYPE = np.dtype([
+    ("frame", "<u4"), ("time", "<f8"), ("frame_ms", "<f4"), ("sim_steps", "u1"), ("state", "u1"),
+    ("score", "<i4"), ("lives", "<i2"), ("enemy_speed", "<f4"), ("spawn_rate", "<f4"),
+    ("enemies", "<u2"), ("particles", "<u4"), ("missiles", "<u2"), ("powerups", "<u2"), ("shockwaves", "<u2"),
+    ("effects", "<u4"),             # bit i: EFFECT_FLAGS[i] was on
+    ("inputs", "<u4"),              # bit i: TELEMETRY_INPUTS[i] happened since the last record
+])
+# held keys first, then key/mouse presses
+TELEMETRY_HELD = ((pygame.K_a, "left"), (pygame.K_d, "right"), (pygame.K_w, "up"), (pygame.K_s, "down"), (pygame.K_t, "drone"))
+TELEMETRY_PRESSED = ((pygame.K_SPACE, "fire"), (pygame.K_e, "overdrive"), (artillery_activation_key, "artillery"), (pygame.K_p, "pause"), (PROFILER_KEY, "profiler"))
+TELEMETRY_INPUTS = tuple(name for _, name in TELEMETRY_HELD + TELEMETRY_PRESSED) + ("click",)
+TELEMETRY_CLICK_BIT = 1 << (len(TELEMETRY_INPUTS) - 1)
+
+
+def input_bits(events, keys=None):
+    # TELEMETRY_INPUTS bitmask for a batch of events (and held keys)
+    bits = 0
+    if keys is not None:
+        for i, (key, _) in enumerate(TELEMETRY_HELD):
+            if keys[key]:
+                bits |= 1 << i
+    for event in events:
+        if event.type == pygame.KEYDOWN:
+            for i, (key, _) in enumerate(TELEMETRY_PRESSED, len(TELEMETRY_HELD)):
+                if event.key == key:
+                    bits |= 1 << i
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            bits |= TELEMETRY_CLICK_BIT
+    return bits
+
+
+class TelemetryRecorder:
+    def __init__(self, capacity=TELEMETRY_CAPACITY):
+        self.capacity = capacity
+        self.ring = np.zeros(capacity, dtype=TELEMETRY_DTYPE)
+        self.columns = {name: self.ring[name] for name in TELEMETRY_DTYPE.names}
+        self.head = 0           # records written (main thread only)
+        self.tail = 0           # records flushed (writer thread only)
+        self.dropped = 0
+        self.thread = None
+        self.wake = threading.Event()
+        self.file = None
+
+    @property
+    def active(self):
+        return self.thread is not None
+
+    def start(self, directory=TELEMETRY_DIR):
+        self.directory = directory
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.part = 0
+        self.written = 0
+        self.failed = False
+        self.head = self.tail = self.dropped = 0
+        self.part_dropped = 0   # drops recorded in the current part's header
+        self.started = time.perf_counter()
+        self.wake.clear()
+        self.thread = threading.Thread(target=self.run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        # stop the writer after a final flush (main() on quit)
+        if self.thread is None:
+            return
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
 
-    # Cutter timers
-    if cutter_active:
-        cutter_active_text = small_font.render(f"CUTTER ACTIVE: {cutter_active_time:.1f}s", True, (180, 220, 255))
-        screen.blit(cutter_active_text, (10, 120))
+    def record(self, game, frame_time, sim_steps, inputs):
+        if self.thread is None or self.failed:
+            return
+        i = self.head % self.capacity
+        c = self.columns
+        c["frame"][i] = self.head
+        c["time"][i] = time.perf_counter() - self.started
+        c["frame_ms"][i] = frame_time * 1000
+        c["sim_steps"][i] = min(sim_steps, 255)
+        c["state"][i] = game.state
+        c["score"][i] = game.score
+        c["lives"][i] = game.lives
+        c["enemy_speed"][i] = game.enemy_speed
+        c["spawn_rate"][i] = game.spawn_rate
+        c["enemies"][i] = len(game.enemies)
+        c["particles"][i] = len(game.particles)
+        c["missiles"][i] = len(game.missiles)
+        c["powerups"][i] = len(game.powerups)
+        c["shockwaves"][i] = len(game.shockwaves)
+        effects = 0
+        for bit, name in enumerate(EFFECT_FLAGS):
+            if getattr(game, name):
+                effects |= 1 << bit
+        c["effects"][i] = effects
+        c["inputs"][i] = inputs
+        # publish only once the row is complete
+        self.head += 1
+
+    # --- writer thread
+    def run(self):
+        while not self.wake.wait(TELEMETRY_FLUSH_SECONDS):
+            self.flush()
+        self.flush()
+        if self.file is not None and not self.failed and self.dropped != self.part_dropped:
+            try:
+                self.rotate()
+            except OSError as e:
+                self.fail(e)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def flush(self):
+        head, tail, cap = self.head, self.tail, self.capacity
+        if head - tail > cap:
+            # a whole ring behind: those records were overwritten
+            self.dropped += head - cap - tail
+            tail = head - cap
+        if head == tail:
+            return
+        start, end = tail % cap, head % cap
+        if start < end:
+            batch = self.ring[start:end].copy()
+        else:
+            batch = np.concatenate((self.ring[start:], self.ring[:end]))
+        # rows the main thread reused while they were being copied
+        overrun = self.head - cap - tail + 1
+        if overrun > 0:
+            batch = batch[overrun:]
+            self.dropped += overrun
+        self.tail = head
+        if not self.failed and len(batch):
+            self.write(batch)
+
+    def write(self, batch):
+        try:
+            if self.file is None or self.written >= TELEMETRY_ROTATE_BYTES:
+                self.rotate()
+            self.file.write(batch.tobytes())
+            self.file.flush()
+            self.written += batch.nbytes
+        except OSError as e:
+            self.fail(e)
+
+    def fail(self, error):
+        warnings.warn(f"telemetry disabled: {error}", RuntimeWarning)
+        self.failed = True
+
+    def rotate(self):
+        if self.file is not None:
+            self.file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"session-{self.session}-{self.part:03d}.tlm.gz")
+        header = {
+            "session": self.session, "part": self.part, "dtype": TELEMETRY_DTYPE.descr,
+            "effects": EFFECT_FLAGS, "inputs": TELEMETRY_INPUTS, "sim_hz": SIM_HZ, "dropped": self.dropped,
+        }
+        self.file = gzip.open(path, "wb", compresslevel=6)
+        self.file.write(TELEMETRY_MAGIC + json.dumps(header).encode() + b"\n")
+        self.part += 1
+        self.part_dropped = self.dropped
+        self.written = 0
+        parts = sorted(name for name in os.listdir(self.directory) if name.startswith("session-") and name.endswith(".tlm.gz"))
+        for name in parts[:-TELEMETRY_KEEP]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+telemetry = TelemetryRecorder()
 
-    # Overdrive UI & cooldown
-    if overdrive_ready:
-        ready_text = small_font.render("OVERDRIVE READY", True, CYAN)
-        screen.blit(ready_text, (10, 160))
-    if overdrive_active:
-        active_text = small_font.render(f"OVERDRIVE: {overdrive_timer:.1f}s", True, CYAN)
-        screen.blit(active_text, (10, 180))
-    if overdrive_on_cooldown:
-        cd_text = small_font.render(f"OVR CD: {overdrive_cd_timer:.1f}s", True, (180, 180, 255))
-        screen.blit(cd_text, (10, 200))
-
-    # Artillery HUD
-    artillery_text = small_font.render(f"ARTILLERY: {artillery_available}", True, (255, 200, 80))
-    screen.blit(artillery_text, (10, 220))
 
+# --- Draw frame
+def draw_pointer_overlay(surface, game, pointer, ticks):
+    # crosshair (and hint / scan ring) at the pointer while targeting;
+    # returns the area it covers
+    cx, cy = pointer
+    rects = []
     # Artillery targeting crosshair (when frozen targeting)
-    if artillery_targeting:
-        mx, my = pygame.mouse.get_pos()
-        cx, cy = mx, my
+    if game.artillery_targeting:
         # red crosshair
-        pygame.draw.line(screen, RED, (cx - 12, cy), (cx + 12, cy), 2)
-        pygame.draw.line(screen, RED, (cx, cy - 12), (cx, cy + 12), 2)
-        pygame.draw.circle(screen, (255, 100, 100), (cx, cy), 6, 2)
-        target_hint = small_font.render("Click to confirm artillery strike", True, RED)
-        screen.blit(target_hint, (cx + 16, cy - 8))
+        rects.append(pygame.draw.line(surface, RED, (cx - 12, cy), (cx + 12, cy), 2))
+        rects.append(pygame.draw.line(surface, RED, (cx, cy - 12), (cx, cy + 12), 2))
+        rects.append(pygame.draw.circle(surface, (255, 100, 100), (cx, cy), 6, 2))
+        target_hint = hud_text.get((small_font, "Click to confirm artillery strike", RED))
+        rects.append(surface.blit(target_hint, (cx + 16, cy - 8)))
     # Hack targeting visuals (last-chance possession)
-    if hack_mode:
-        mx, my = pygame.mouse.get_pos()
-        cx, cy = mx, my
-
+    if game.hack_mode:
         # red crosshair
-        pygame.draw.line(screen, RED, (cx - 14, cy), (cx + 14, cy), 3)
-        pygame.draw.line(screen, RED, (cx, cy - 14), (cx, cy + 14), 3)
-        pygame.draw.circle(screen, (255, 80, 80), (cx, cy), 8, 2)
+        rects.append(pygame.draw.line(surface, RED, (cx - 14, cy), (cx + 14, cy), 3))
+        rects.append(pygame.draw.line(surface, RED, (cx, cy - 14), (cx, cy + 14), 3))
+        rects.append(pygame.draw.circle(surface, (255, 80, 80), (cx, cy), 8, 2))
 
         # subtle scan ring
-        scan_radius = 42 + int(math.sin(pygame.time.get_ticks() * 0.01) * 6)
-        pygame.draw.circle(screen, (255, 60, 60), (cx, cy), scan_radius, 2)
+        scan_radius = 42 + int(math.sin(ticks * 0.01) * 6)
+        rects.append(pygame.draw.circle(surface, (255, 60, 60), (cx, cy), scan_radius, 2))
+    return rects[0].unionall(rects[1:]) if rects else None
+
+
+def draw_window(game, t=1.0, present=True):
+    # t: how far render time is between the previous and the current sim step
+    # (0..1); moving things are drawn interpolated, lag is the same in seconds.
+    # present=False stops after the HUD, leaving the frame on the screen
+    # without pointer overlays or post-processing (see FrozenFrame).
+    profiler.mark()
+    lag = (1 - t) * SIM_DT
+    shake = int(game.screen_shake)
+    shake_x = random.randint(-shake, shake) if shake > 0 else 0
+    shake_y = random.randint(-shake, shake) if shake > 0 else 0
+    p = game.player.move(round((game.player_prev.x - game.player.x) * (1 - t)), round((game.player_prev.y - game.player.y) * (1 - t)))
+    wp = world_rect(p)
+    shake_x, shake_y = world_xy(shake_x, shake_y)
+
+    # On the dirty-rect path (window-resolution only), whole-screen effects
+    # can't be tracked per tile and force a full redraw. Frozen targeting
+    # frames are drawn straight to the screen.
+    dirty = None
+    surface = world
+    if DIRTY_RECTS and world is screen and not (game.artillery_targeting or game.hack_mode):
+        dirty = renderer
+        surface = renderer.begin(shake > 0 or game.plasma_active or game.orbital_beam_active)
+    elif DIRTY_RECTS:
+        renderer.invalidate()
+
+    if dirty is None or dirty.full:
+        surface.fill(BLACK_SPACE)
+
+        # Stars (held still as the backdrop on the dirty-rect path)
+        starfield.draw(surface, lag if dirty is None else 0.0)
+        if dirty is not None:
+            dirty.capture_background()
+    profiler.lap("stars")
 
-        # center message
-        hack_text = large_font.render("HACK AN ENEMY", True, RED)
-        screen.blit(hack_text, (WIDTH // 2 - hack_text.get_width() // 2, HEIGHT // 2 - 90))
+    # Particles
+    queue = render_queue
+    game.particles.submit(queue, lag)
+    submit_shockwaves(queue, game.shockwaves)
+    queue.flush(surface, dirty, through=LAYER_SHOCKWAVES)
+    profiler.lap("fx")
+
+    # Player
+    if game.player_invincible and int(game.player_invincible_time * 10) % 2:
+        pygame.draw.circle(surface, NEON_PINK, (wp.centerx, wp.centery), world_len(60), world_len(2))
+        pygame.draw.circle(surface, NEON_PINK, (wp.centerx, wp.centery), world_len(50), 1)
+        pygame.draw.polygon(surface, NEON_PINK, [(wp.centerx, wp.top + shake_x), (wp.right, wp.centery + shake_y), (wp.centerx, wp.bottom + shake_x), (wp.left, wp.centery + shake_y)])
+    else:
+        pygame.draw.polygon(surface, RED, [(wp.centerx, wp.top + shake_x), (wp.right, wp.centery + shake_y), (wp.centerx, wp.bottom + shake_x), (wp.left, wp.centery + shake_y)])
+
+    if game.player_shield:
+        pygame.draw.circle(surface, SHIELD_COLOR, wp.center, world_len(60), world_len(3))
+
+    # Orbital cue
+    if game.orbital_charging and int(game.orbital_charge_time * 10) % 2:
+        pygame.draw.circle(surface, (255, 200, 50), (wp.centerx, wp.centery), world_len(70), world_len(3))
+        pygame.draw.circle(surface, (255, 200, 50), (wp.centerx, wp.centery), world_len(55), 1)
+    if dirty is not None:
+        # rings, shield and overdrive aura around the ship
+        dirty.add(p.inflate(150, 150) if game.overdrive_active else p.inflate(100, 100))
+    # Enemies & powerups
+    game.enemies.submit(queue, t)
+    for powerup in game.powerups:
+        queue.submit(LAYER_POWERUPS, ('powerup', powerup.type), *world_xy(powerup.rect.x - POWERUP_SPRITE_MARGIN, powerup.rect.y - POWERUP_SPRITE_MARGIN))
+
+    # Plasma ring
+    if game.plasma_active:
+        radius = max(PLASMA_RING_BUCKET, round(world_len(game.plasma_radius) / PLASMA_RING_BUCKET) * PLASMA_RING_BUCKET)
+        queue.submit_surface(LAYER_EFFECTS, plasma_rings.get(radius), wp.centerx - radius - 1, wp.centery - radius - 1)
+
+    # Orbital beam (cone from the top of the screen down to the ship)
+    if game.orbital_beam_active:
+        cone = orbital_cones.get(orbital_cone_height(wp.top))
+        # foot on the ship; the full-width edge is at or just above the screen top
+        queue.submit_surface(LAYER_EFFECTS, cone, wp.centerx - cone.get_width() // 2, wp.top + EFFECT_PAD - cone.get_height())
+
+    # Missiles (player + support drone, pre-built sprites)
+    submit_projectiles(queue, game.missiles, game.support_drone_missiles, game.overdrive_active, lag)
+
+    # Cutter blades (draw after player so they appear around the ship)
+    for blade in game.cutter_blades:
+        blade.submit(queue, t)
+    # Support Drone
+    if game.support_drone:
+        game.support_drone.submit(queue, t)
 
     # Overdrive aura: red burning ring (visual + damage region drawn elsewhere)
-    if overdrive_active:
-        burn_radius = 90
-        aura_surf = pygame.Surface((200, 200), pygame.SRCALPHA)
-        pygame.draw.circle(aura_surf, (255, 60, 60, 160), (100, 100), burn_radius, 6)
-        screen.blit(aura_surf, (player.centerx - 100, player.centery - 100), special_flags=pygame.BLEND_RGBA_ADD)
-
-    # CRT overlay
-    screen.blit(crt_surface, (0, 0))
-    pygame.display.update()
+    if game.overdrive_active:
+        aura = overdrive_auras.get(0)
+        half = aura.get_width() // 2
+        queue.submit_surface(LAYER_AURA, aura, wp.centerx - half, wp.centery - half, pygame.BLEND_RGBA_ADD)
+    queue.flush(surface, dirty)
+    profiler.lap("entities")
+
+    # Scale the world up to the window once; the HUD and pointer overlays
+    # below are drawn over it at native resolution so text stays sharp.
+    # Nearest-neighbour keeps the upscale cheap (and suits the CRT look).
+    if surface is not screen and dirty is None:
+        post.apply(world, world_space=True)
+        pygame.transform.scale(world, screen.get_size(), screen)
+        surface = screen
+    profiler.lap("upscale")
 
-    screen_shake = max(0, screen_shake - 1)
+    # HUD
+    hud_rects = draw_hud(surface, game)
+    if profiler.enabled:
+        hud_rects.append(profiler.draw(surface, game))
+
+    # center message while picking an enemy to hack
+    if game.hack_mode:
+        hack_text = hud_text.get((large_font, "HACK AN ENEMY", RED))
+        surface.blit(hack_text, (WIDTH // 2 - hack_text.get_width() // 2, HEIGHT // 2 - 90))
+    profiler.lap("hud")
+    if not present:
+        return
+    draw_pointer_overlay(surface, game, pygame.mouse.get_pos(), pygame.time.get_ticks())
+
+    # Post-processing (CRT scanlines) + present
+    if dirty is None:
+        post.apply(screen)
+        pygame.display.update()
+    else:
+        for r in hud_rects:
+            dirty.add(r)
+        dirty.present(screen, post)
+    profiler.lap("present")
 
 
 # --- Menus
-def draw_game_over():
+def draw_game_over(game):
+    renderer.invalidate()
+    frozen_frame.release()
     screen.fill(BLACK_SPACE)
-    game_over_text = large_font.render("MISSION FAILED", True, RED)
-    final_score_text = font.render(f"FINAL SCORE: {score}", True, NEON_GREEN)
-    high_score_text = font.render(f"HIGH SCORE: {high_score}", True, CYAN)
-    restart_text = font.render("SPACE: Restart & Q: Quit", True, WHITE)
+    game_over_text = render_text(large_font, "MISSION FAILED", RED)
+    final_score_text = render_text(font, f"FINAL SCORE: {game.score}", NEON_GREEN)
+    high_score_text = render_text(font, f"HIGH SCORE: {game.high_score}", CYAN)
+    restart_text = render_text(font, "SPACE: Restart & Q: Quit", WHITE)
     screen.blit(game_over_text, (WIDTH // 2 - 160, HEIGHT // 2 - 120))
     screen.blit(final_score_text, (WIDTH // 2 - 150, HEIGHT // 2 - 20))
     screen.blit(high_score_text, (WIDTH // 2 - 160, HEIGHT // 2 + 20))
@@ -770,609 +2544,566 @@ def draw_game_over():
 
 
 def draw_pause():
+    renderer.invalidate()
+    frozen_frame.release()
     screen.fill(BLACK_SPACE)
-    pause_text = large_font.render("SYSTEMS PAUSED", True, CYAN)
-    resume_text = font.render("P: Resume", True, WHITE)
+    pause_text = render_text(large_font, "SYSTEMS PAUSED", CYAN)
+    resume_text = render_text(font, "P: Resume", WHITE)
     screen.blit(pause_text, (WIDTH // 2 - 180, HEIGHT // 2 - 50))
     screen.blit(resume_text, (WIDTH // 2 - 110, HEIGHT // 2 + 50))
     pygame.display.update()
 
 
-# --- Reset
-def reset_game():
-    global score, lives, enemy_speed, spawn_rate, game_state, high_score
-    global player_shield, player_shield_time, player_invincible, player_invincible_time
-    global rapid_fire, rapid_fire_time, rapid_fire_counter
-    global orbital_count, orbital_beam_active, orbital_charging, orbital_charge_time
-    global plasma_active, plasma_radius, plasma_hits
-    global overdrive_points, overdrive_ready, overdrive_active, overdrive_timer, overdrive_on_cooldown, overdrive_cd_timer
-    global cutter_active, cutter_active_time, cutter_blades
-    global artillery_available, artillery_targeting, artillery_pending, artillery_drop_timer
-    global hack_mode, hack_available, hacked_enemy
+# --- Idle screens
+# Paused, game-over and frozen targeting screens only change on input, so
+# they are drawn once and the main loop then blocks in pygame.event.wait()
+# instead of spinning at the frame cap. Targeting keeps a snapshot of the
+# frozen frame and only redraws the box around the pointer overlay.
+IDLE_WAIT_MS = 250        # longest sleep between wake-ups with no input
+HACK_PULSE_MS = 50        # hack scan ring animation step
 
-    hack_mode = False
-    hack_available = True
-    hacked_enemy = None
 
-    score = 0
-    lives = 3
-    enemy_speed = 4
-    spawn_rate = 25
+def wait_events(timeout_ms):
+    # block until input arrives (or timeout_ms passes), then drain the queue
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
-    enemies.clear()
-    missiles.clear()
-    powerups.clear()
-    particles.clear()
-    shockwaves.clear()
-
-    player.x = WIDTH // 2
-
-    player_shield = False
-    player_shield_time = 0
-
-    player_invincible = False
-    player_invincible_time = 0
-
-    rapid_fire = False
-    rapid_fire_time = 0
-    rapid_fire_counter = 0
-
-    orbital_count = 0
-    orbital_charging = False
-    orbital_charge_time = 0
-    orbital_beam_active = False
-
-    plasma_active = False
-    plasma_radius = 0.0
-    plasma_hits.clear()
-
-    overdrive_points = 0
-    overdrive_ready = False
-    overdrive_active = False
-    overdrive_timer = 0.0
-    overdrive_on_cooldown = False
-    overdrive_cd_timer = 0.0
-
-    cutter_active = False
-    cutter_active_time = 0.0
-    cutter_blades.clear()
-
-    artillery_available = 0
-    artillery_targeting = False
-    artillery_pending = False
-    artillery_drop_timer = 0.0
-
-    game_state = PLAYING
-
-
-# --- Main loop
-def main():
-    global score, lives, enemy_speed, spawn_rate, game_state, high_score, screen_shake
-    global player_shield, player_shield_time, player_invincible, player_invincible_time
-    global support_drone, support_drone_missiles
-    global hacked_enemy, hack_mode, hack_available
-    global rapid_fire, rapid_fire_time, rapid_fire_counter
-    global orbital_count, orbital_charging, orbital_charge_duration, orbital_charge_time
-    global orbital_beam_active, orbital_beam_time, orbital_beam_duration, orbital_beam_width
-    global plasma_active, plasma_radius, plasma_max_radius, plasma_expand_speed, plasma_hits
-    global overdrive_points, overdrive_ready, overdrive_active, overdrive_timer, overdrive_on_cooldown, overdrive_cd_timer
-    global cutter_active, cutter_active_time, cutter_spin_duration, cutter_blades
-    global artillery_available, artillery_targeting, artillery_pending, artillery_target_pos, artillery_drop_timer
-    
-    running = True
-
-    while running:
-        clock.tick(30)
 
-        if game_state == PAUSED:
-            draw_pause()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
-                    game_state = PLAYING
-            continue
-
-        if game_state == GAME_OVER:
-            draw_game_over()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        reset_game()
-                    if event.key == pygame.K_q:
-                        running = False
-            continue
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and not artillery_targeting:
-                    # fire missile
-                    missiles.append(pygame.Rect(player.centerx - 5, player.top, 10, 20))
-                    play_sound(overdrive_sound if overdrive_active else shoot_sound)
-                    # muzzle flash particle
-                    particles.append(Particle(player.centerx, player.top, random.uniform(-1, 1), -3, lifetime=12, color=(255, 255, 200)))
-                if event.key == pygame.K_p:
-                    game_state = PAUSED
-                if (event.key == pygame.K_e and
-                    overdrive_ready and
-                    not overdrive_active and
-                    not overdrive_on_cooldown and
-                    not artillery_targeting and
-                    not hacked_enemy):
-
-                    overdrive_active = True
-                    overdrive_ready = False
-                    overdrive_points = 0
-                    overdrive_timer = 5.0
-                    play_sound(overdrive_sound)
-                    # small activation burst
-                    for _ in range(12):
-                        particles.append(Particle(player.centerx + random.uniform(-20, 20), player.centery + random.uniform(-20, 20), random.uniform(-3, 3), random.uniform(-3, 3), lifetime=30, color=(0, 230, 255)))
-                if event.key == artillery_activation_key and artillery_available > 0 and not artillery_targeting and not artillery_pending and game_state == PLAYING:
-                    # begin targeting: freeze the game visually and stop updates
-                    artillery_targeting = True
-                    # capture mouse so player can choose
-                    pygame.mouse.set_visible(True)
-                    play_sound(powerup_sound or overdrive_sound)
-
-            # Mouse click handling during targeting
-            if event.type == pygame.MOUSEBUTTONDOWN and artillery_targeting:
-                mx, my = pygame.mouse.get_pos()
-                artillery_target_pos = (mx, my)
-                artillery_pending = True
-                artillery_drop_timer = artillery_drop_delay
-                artillery_targeting = False
-                artillery_available = max(0, artillery_available - 1)
-                # unhide/hide mouse as desired
-                pygame.mouse.set_visible(False)
-                # small confirmation burst on click (visual)
-                for _ in range(8):
-                    particles.append(Particle(mx + random.uniform(-8,8), my + random.uniform(-8,8), random.uniform(-2,2), random.uniform(-2,2), lifetime=18, color=(255,180,60)))
-                # resume the game (updates continue)
-            # Mouse click handling during HACK MODE
-            if event.type == pygame.MOUSEBUTTONDOWN and hack_mode:
-                mx, my = pygame.mouse.get_pos()
-                for enemy in enemies:
-                    if enemy.rect.collidepoint(mx, my):
-                        hacked_enemy = enemy
-                        hack_mode = False
-                        lives = 1
-                        pygame.mouse.set_visible(False)
-
-                        # move player into hacked enemy
-                        player.center = enemy.rect.center
-                        enemies.remove(enemy)
-
-                        # ---- disable support drone (PART B) ----
-                        support_drone = None
-                        support_drone_missiles.clear()
-                        # ---------------------------------------
-
-                        break
-            #  Hack 
-        if hack_mode:
-            draw_window()
-            continue
-        # ---------------------------
-
-        # If we're currently in targeting mode, we must render the frozen frame and skip all updates.
-        if artillery_targeting:
-            # draw the window (it will render current state + crosshair because draw_window uses artillery_targeting flag)
-            draw_window()
-            # do not progress game timers, enemy movement, particles, missiles, etc. (they appear frozen on screen)
-            continue
+class FrozenFrame:
+    def __init__(self):
+        self.snapshot = None
+        self.overlay = None     # screen area under the last pointer overlay
+        self.pointer = None
+
+    def release(self):
+        # the next freeze (or an expose) re-renders the snapshot
+        self.snapshot = None
+
+    def draw(self, game):
+        pointer = pygame.mouse.get_pos()
+        ticks = pygame.time.get_ticks()
+        if self.snapshot is None:
+            draw_window(game, present=False)
+            self.snapshot = alloc_tracker.note(screen.copy())
+            self.overlay = draw_pointer_overlay(screen, game, pointer, ticks)
+            self.pointer = pointer
+            post.apply(screen)
+            pygame.display.update()
+            return
+        if pointer == self.pointer and not game.hack_mode:
+            return
+        # the first pass only measures the new overlay; the box covering old
+        # and new is then rebuilt from the snapshot and post-processed once
+        new = draw_pointer_overlay(screen, game, pointer, ticks)
+        area = new.union(self.overlay) if self.overlay else new
+        area = area.clip(screen.get_rect())
+        screen.blit(self.snapshot, area, area)
+        draw_pointer_overlay(screen, game, pointer, ticks)
+        self.pointer = pointer
+        self.overlay = new
+        post.apply(screen, [area])
+        pygame.display.update(area)
+
+
+frozen_frame = FrozenFrame()
+
+
+# --- Game state
+# One independent game: the player, enemies, projectiles, power-up timers,
+# score and the effect pools. Nothing here touches the display or the
+# mixer (sounds play only after init_audio()), so any number of Games can be
+# stepped side by side in one process; the main loop below drives one with
+# input and draws it.
+class Game:
+    def __init__(self, score_file=SCORE_FILE):
+        # score_file=None keeps the high score in memory only
+        self.score_file = score_file
+        self.state = PLAYING
+        self.score = 0
+        self.high_score = load_high_score(score_file) if score_file else 0
+        self.lives = 3
+        self.enemy_speed = 120   # px/s
+        self.spawn_rate = 1.2    # spawns per second
+        # Screen shake magnitude (px) used after taking a hit
+        self.screen_shake = 0
+        # Rects hold integer coordinates; movement of less than a pixel per
+        # step is carried over per key so speeds stay exact at any SIM_HZ.
+        self.move_carry = {}
+
+        self.enemies = EnemyStore()
+        self.kills = KillQueue(self.enemies)
+        self.missiles = []
+        self.powerups = []
+        self.particles = ParticleSystem()
+        self.shockwaves = []
+
+        self.player = pygame.Rect(WIDTH // 2, HEIGHT - player_size - 10, player_size, player_size)
+        self.player_prev = self.player.copy()   # player rect at the previous sim step
+        self.player_shield = False
+        self.player_shield_time = 0
+        self.player_invincible = False
+        self.player_invincible_time = 0
+        self.rapid_fire = False
+        self.rapid_fire_time = 0
+        self.rapid_fire_counter = 0
+
+        self.orbital_count = 0
+        self.orbital_charging = False
+        self.orbital_charge_time = 0.0
+        self.orbital_beam_active = False
+        self.orbital_beam_time = 0.0
+
+        self.plasma_active = False
+        self.plasma_radius = 0.0
+        self.plasma_hits = set()
+
+        self.overdrive_points = 0
+        self.overdrive_ready = False
+        self.overdrive_active = False
+        self.overdrive_timer = 0.0
+        self.overdrive_on_cooldown = False
+        self.overdrive_cd_timer = 0.0
+
+        self.cutter_active = False
+        self.cutter_active_time = 0.0        # spin duration remaining (seconds)
+        self.cutter_blades = []              # list of CutterBlade instances
+
+        self.artillery_available = 0         # number of artillery charges the player has
+        self.artillery_targeting = False     # true while the game is frozen and player picks a target
+        self.artillery_pending = False       # true after target picked, countdown until impact
+        self.artillery_target_pos = (0, 0)
+        self.artillery_drop_timer = 0.0
+
+        # Hack state (experimental feature)
+        self.hack_mode = False
+        self.hacked_enemy = None
+        self.hack_available = True
+
+        self.support_drone = None
+        self.support_drone_missiles = []
+
+    def reset(self):
+        self.hack_mode = False
+        self.hack_available = True
+        self.hacked_enemy = None
+
+        self.score = 0
+        self.lives = 3
+        self.enemy_speed = 120
+        self.spawn_rate = 1.2
+        self.move_carry.clear()
+
+        self.enemies.clear()
+        self.kills.clear()
+        self.missiles.clear()
+        self.powerups.clear()
+        self.particles.clear()
+        self.shockwaves.clear()
+
+        self.player.x = WIDTH // 2
+        self.player_prev.topleft = self.player.topleft
+
+        self.player_shield = False
+        self.player_shield_time = 0
+
+        self.player_invincible = False
+        self.player_invincible_time = 0
+
+        self.rapid_fire = False
+        self.rapid_fire_time = 0
+        self.rapid_fire_counter = 0
+
+        self.orbital_count = 0
+        self.orbital_charging = False
+        self.orbital_charge_time = 0
+        self.orbital_beam_active = False
+
+        self.plasma_active = False
+        self.plasma_radius = 0.0
+        self.plasma_hits.clear()
+
+        self.overdrive_points = 0
+        self.overdrive_ready = False
+        self.overdrive_active = False
+        self.overdrive_timer = 0.0
+        self.overdrive_on_cooldown = False
+        self.overdrive_cd_timer = 0.0
+
+        self.cutter_active = False
+        self.cutter_active_time = 0.0
+        self.cutter_blades.clear()
+
+        self.artillery_available = 0
+        self.artillery_targeting = False
+        self.artillery_pending = False
+        self.artillery_drop_timer = 0.0
+
+        self.state = PLAYING
+
+    def whole_pixels(self, key, distance):
+        total = distance + self.move_carry.get(key, 0.0)
+        whole = int(total)
+        self.move_carry[key] = total - whole
+        return whole
+
+    def save_high_score(self):
+        if self.score_file:
+            save_high_score(self.high_score, self.score_file)
+
+    # --- Player actions (keyboard / mouse in main(), scripts in bench.py)
+    def fire(self):
+        self.missiles.append(pygame.Rect(self.player.centerx - 5, self.player.top, 10, 20))
+        play_sound(overdrive_sound if self.overdrive_active else shoot_sound)
+        # muzzle flash particle
+        self.particles.emit(self.player.centerx, self.player.top, random.uniform(-30, 30), -90, lifetime=0.4, color=(255, 255, 200))
+
+    def activate_overdrive(self):
+        if (not self.overdrive_ready or self.overdrive_active or self.overdrive_on_cooldown
+                or self.artillery_targeting or self.hacked_enemy):
+            return False
+        self.overdrive_active = True
+        self.overdrive_ready = False
+        self.overdrive_points = 0
+        self.overdrive_timer = 5.0
+        play_sound(overdrive_sound)
+        # small activation burst
+        self.particles.burst(12, (self.player.centerx - 20, self.player.centerx + 20), (self.player.centery - 20, self.player.centery + 20), (-90, 90), (-90, 90), lifetime=1.0, color=(0, 230, 255))
+        return True
+
+    def begin_artillery(self):
+        # begin targeting: the game freezes until target_artillery()
+        if self.artillery_available <= 0 or self.artillery_targeting or self.artillery_pending or self.state != PLAYING:
+            return False
+        self.artillery_targeting = True
+        play_sound(powerup_sound or overdrive_sound)
+        return True
+
+    def target_artillery(self, pos):
+        mx, my = pos
+        self.artillery_target_pos = (mx, my)
+        self.artillery_pending = True
+        self.artillery_drop_timer = artillery_drop_delay
+        self.artillery_targeting = False
+        self.artillery_available = max(0, self.artillery_available - 1)
+        # small confirmation burst on click (visual)
+        self.particles.burst(8, (mx - 8, mx + 8), (my - 8, my + 8), (-60, 60), (-60, 60), lifetime=0.6, color=(255, 180, 60))
+
+    def hack(self, pos):
+        # last-chance possession of the enemy under pos; True if one was taken
+        for enemy in self.enemies.query_point(*pos):
+            self.hacked_enemy = enemy
+            self.hack_mode = False
+            self.lives = 1
+
+            # move player into hacked enemy
+            self.player.center = enemy.rect.center
+            self.player_prev.center = self.player.center
+            self.enemies.remove(enemy)
+
+            # ---- disable support drone (PART B) ----
+            self.support_drone = None
+            self.support_drone_missiles.clear()
+            # ---------------------------------------
+            return True
+        return False
+
+    def spawn_thruster(self, dt):
+        self.particles.burst(rate_count(60, dt), (self.player.centerx - 6, self.player.centerx + 6), (self.player.bottom, self.player.bottom + 4), (-24, 24), (54, 96), lifetime=0.6, color=(150, 200, 255))
+
+    # --- Simulation step
+    def update(self, dt, keys):
+        # advance the game by one fixed sim step of dt seconds; keys is the
+        # pygame.key.get_pressed() state for the step
+        profiler.mark()
+        self.player_prev.topleft = self.player.topleft
+        self.screen_shake = max(0, self.screen_shake - SHAKE_DECAY * dt)
 
         # Timers
-        if player_shield:
-            player_shield_time -= 1 / 30
-            if player_shield_time <= 0:
-                player_shield = False
-        if rapid_fire:
-            rapid_fire_time -= 1 / 30
-            if rapid_fire_time <= 0:
-                rapid_fire = False
-        if player_invincible:
-            player_invincible_time -= 1 / 30
-            if player_invincible_time <= 0:
-                player_invincible = False
+        if self.player_shield:
+            self.player_shield_time -= dt
+            if self.player_shield_time <= 0:
+                self.player_shield = False
+        if self.rapid_fire:
+            self.rapid_fire_time -= dt
+            if self.rapid_fire_time <= 0:
+                self.rapid_fire = False
+        if self.player_invincible:
+            self.player_invincible_time -= dt
+            if self.player_invincible_time <= 0:
+                self.player_invincible = False
+        if self.player_invincible and int(self.player_invincible_time * 10) % 2:
+            for _ in range(rate_count(9, dt)):
+                self.particles.emit(self.player.centerx + random.randint(-40, 40), self.player.centery + random.randint(-40, 40), random.uniform(-60, 60), random.uniform(-60, 60), lifetime=0.67, color=NEON_PINK)
 
         # Overdrive timer
-        if overdrive_active:
-            overdrive_timer -= 1 / 30
-            if overdrive_timer <= 0:
-                overdrive_active = False
-                overdrive_on_cooldown = True
-                overdrive_cd_timer = overdrive_cooldown
-        if overdrive_on_cooldown:
-            overdrive_cd_timer -= 1 / 30
-            if overdrive_cd_timer <= 0:
-                overdrive_on_cooldown = False
-                overdrive_cd_timer = 0.0
-                
-        if hacked_enemy:
-            overdrive_active = True
-            overdrive_ready = False
-            overdrive_on_cooldown = False
-            overdrive_timer = 9999
+        if self.overdrive_active:
+            self.overdrive_timer -= dt
+            if self.overdrive_timer <= 0:
+                self.overdrive_active = False
+                self.overdrive_on_cooldown = True
+                self.overdrive_cd_timer = overdrive_cooldown
+        if self.overdrive_on_cooldown:
+            self.overdrive_cd_timer -= dt
+            if self.overdrive_cd_timer <= 0:
+                self.overdrive_on_cooldown = False
+                self.overdrive_cd_timer = 0.0
+            
+        if self.hacked_enemy:
+            self.overdrive_active = True
+            self.overdrive_ready = False
+            self.overdrive_on_cooldown = False
+            self.overdrive_timer = 9999
         # ----- LOCK GAMEPLAY AT ZERO LIVES -----
-        if lives == 0 and not hacked_enemy and not hack_mode:
-            hack_mode = True
-            hack_available = False
-            pygame.mouse.set_visible(True)
+        if self.lives == 0 and not self.hacked_enemy and not self.hack_mode:
+            self.hack_mode = True
+            self.hack_available = False
         # --------------------------------------
 
         # Player movement
-        keys = pygame.key.get_pressed()
-        moving = False
-        if keys[pygame.K_a] and player.left > 0:
-            player.x -= (player_speed + 3 if overdrive_active else player_speed)
-            moving = True
-        if keys[pygame.K_d] and player.right < WIDTH:
-            player.x += (player_speed + 3 if overdrive_active else player_speed)
-            moving = True
-        if keys[pygame.K_w] and player.top > 50:
-            player.y -= (player_speed + 3 if overdrive_active else player_speed)
-            moving = True
-        if keys[pygame.K_s] and player.bottom < HEIGHT:
-            player.y += (player_speed + 3 if overdrive_active else player_speed)
-            moving = True
-        if moving:
-            spawn_thruster()
-        if keys[pygame.K_t] and not hacked_enemy:   # press T to summon support drone
-            support_drone = SupportDrone()
-        if support_drone:
-            support_drone.update()
+        step = (player_speed + 90 if self.overdrive_active else player_speed) * dt
+        dx = dy = 0.0
+        if keys[pygame.K_a] and self.player.left > 0:
+            dx -= step
+        if keys[pygame.K_d] and self.player.right < WIDTH:
+            dx += step
+        if keys[pygame.K_w] and self.player.top > 50:
+            dy -= step
+        if keys[pygame.K_s] and self.player.bottom < HEIGHT:
+            dy += step
+        self.player.x += self.whole_pixels('player_x', dx)
+        self.player.y += self.whole_pixels('player_y', dy)
+        if dx or dy:
+            self.spawn_thruster(dt)
+        if keys[pygame.K_t] and not self.hacked_enemy:   # press T to summon support drone
+            self.support_drone = SupportDrone(self)
+        if self.support_drone:
+            self.support_drone.update(dt)
+        profiler.lap("player")
 
         # Plasma update
-        if plasma_active:
-            plasma_radius += plasma_expand_speed
-            for enemy in enemies[:]:
-                if id(enemy) in plasma_hits:
+        if self.plasma_active:
+            # the whole disc is tested every step: the ship and enemies move
+            # further per step than the front grows, so an enemy can get
+            # inside the previous radius without the front passing over it
+            self.plasma_radius += plasma_expand_speed * dt
+            hits = aoe_circle(self.enemies.centers(), self.player.centerx, self.player.centery, self.plasma_radius)
+            for enemy in self.enemies.select(hits):
+                if id(enemy) in self.plasma_hits:
                     continue
-                dx = enemy.rect.centerx - player.centerx
-                dy = enemy.rect.centery - player.centery
-                if dx * dx + dy * dy <= (plasma_radius * plasma_radius):
-                    plasma_hits.add(id(enemy))
-                    if enemy.type == EnemyType.CAPITAL:
-                        enemy.health -= enemy.health * 0.5
-                        for _ in range(12):
-                            particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, random.uniform(-4, 4), random.uniform(-4, 4), color=(0, 255, 255)))
-                        if enemy.health <= 0:
-                            try:
-                                enemies.remove(enemy)
-                            except ValueError:
-                                pass
-                            score += 3
-                            overdrive_points += 1
-                            if overdrive_points >= 5:
-                                overdrive_ready = True
-                    else:
-                        for _ in range(15):
-                            particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, random.uniform(-5, 5), random.uniform(-5, 5), color=(0, 255, 255)))
-                        try:
-                            enemies.remove(enemy)
-                        except ValueError:
-                            pass
-                        score += 1 if enemy.type == EnemyType.DRONE else 2
-            screen_shake = max(screen_shake, 3)
-            if plasma_radius >= plasma_max_radius:
-                plasma_active = False
-                plasma_hits.clear()
+                self.plasma_hits.add(id(enemy))
+                if enemy.type == EnemyType.CAPITAL:
+                    enemy.health -= enemy.health * 0.5
+                    self.particles.burst(12, enemy.rect.centerx, enemy.rect.centery, (-120, 120), (-120, 120), color=(0, 255, 255))
+                    if enemy.health <= 0:
+                        self.kills.push(enemy, overdrive=1)
+                else:
+                    self.kills.push(enemy, fx=(15, 150, (0, 255, 255)))
+            self.screen_shake = max(self.screen_shake, 3)
+            for _ in range(rate_count(18, dt)):
+                angle = random.random() * math.tau
+                px = self.player.centerx + math.cos(angle) * self.plasma_radius
+                py = self.player.centery + math.sin(angle) * self.plasma_radius
+                self.particles.emit(px, py, random.uniform(-24, 24), random.uniform(-24, 24), lifetime=0.67, color=(0, 255, 255))
+            if self.plasma_radius >= plasma_max_radius:
+                self.plasma_active = False
+                self.plasma_hits.clear()
+        profiler.lap("aoe")
 
         # Smooth continuous difficulty scaling
-        enemy_speed = min(9, 4 + score * 0.03)
-        spawn_rate = max(6, int(25 - score * 0.12))
+        self.enemy_speed = min(270, 120 + self.score * 0.9)
+        self.spawn_rate = 30 / max(6, int(25 - self.score * 0.12))
 
         # Enemy spawn
-        if random.randint(1, max(1, spawn_rate)) == 1:
+        if random.random() < self.spawn_rate * dt:
             x_pos = random.randint(0, WIDTH - 40)
             enemy_type_choice = random.choices([EnemyType.DRONE, EnemyType.FIGHTER, EnemyType.CAPITAL], weights=[50, 30, 20])[0]
-            enemies.append(Enemy(x_pos, 0, enemy_type_choice))
-
-        # Enemy movement + collision
-        # --- NEW: enemy movement patterns ---
-        for enemy in enemies:
-            # Initialize pattern attributes if missing
-            if not hasattr(enemy, 'pattern'):
-                enemy.pattern = random.choice(['straight','zigzag','dash','circle'])
-                enemy.timer = 0
-                enemy.angle = random.uniform(0, math.tau)
-                enemy.dash_used = False
-                enemy.circle_done = False
-
-            enemy.timer += 1/30
-
-        # Old loop starts here
-        for enemy in enemies[:]:
-            # per-type speeds
-            drone_speed = enemy_speed
-            fighter_speed = enemy_speed * 1.5
-            capital_speed = enemy_speed * 0.7
-
-            if cutter_active:
-                speed = enemy_speed * 0.2
-            else:
-                if enemy.type == EnemyType.DRONE:
-                    speed = drone_speed
-                elif enemy.type == EnemyType.FIGHTER:
-                    speed = fighter_speed
-                else:
-                    speed = capital_speed
-
-            # === MOVEMENT PATTERNS ===
-            if enemy.pattern == 'straight':
-                enemy.rect.y += speed
-            elif enemy.pattern == 'zigzag':
-                enemy.rect.y += speed
-                enemy.rect.x += math.sin(enemy.timer * 4) * 6
-            elif enemy.pattern == 'dash':
-                if not enemy.dash_used and enemy.rect.centery > HEIGHT * 0.33:
-                    enemy.dash_used = True
-                    enemy.dash_vy = speed * 4
-                if enemy.dash_used:
-                    enemy.rect.y += enemy.dash_vy
-                else:
-                    enemy.rect.y += speed
-            elif enemy.pattern == 'circle':
-                if not enemy.circle_done:
-                    enemy.angle += 0.07
-                    r = 120
-                    enemy.rect.centerx = player.centerx + math.cos(enemy.angle) * r
-                    enemy.rect.centery = player.centery + math.sin(enemy.angle) * r
-                    if enemy.angle > math.tau:
-                        enemy.circle_done = True
+            self.enemies.spawn(x_pos, 0, enemy_type_choice)
+
+        # Enemy movement + collision (every pattern advanced as one batched update)
+        self.enemies.advance(dt, self.enemy_speed, self.cutter_active, self.player.centerx, self.player.centery, HEIGHT)
+        for enemy in self.enemies.below(HEIGHT):
+            self.kills.push(enemy, points=0)
+        for enemy in self.enemies.overlapping(self.player):
+            if not self.player_invincible:
+                if self.player_shield:
+                    self.player_shield = False
+                    play_sound(hit_sound)
+                    self.particles.burst(8, self.player.centerx, self.player.centery, (-90, 90), (-90, 90))
+                    self.kills.push(enemy, points=0)
                 else:
-                    enemy.rect.y += speed
-            if enemy.rect.top > HEIGHT:
-                try:
-                    enemies.remove(enemy)
-                except ValueError:
-                    pass
-            elif enemy.rect.colliderect(player):
-                if not player_invincible:
-                    if player_shield:
-                        player_shield = False
-                        play_sound(hit_sound)
-                        for _ in range(8):
-                            particles.append(Particle(player.centerx, player.centery, random.uniform(-3, 3), random.uniform(-3, 3)))
-                        try:
-                            enemies.remove(enemy)
-                        except ValueError:
-                            pass
-                    else:
-                        lives -= 1
-                        lives = max(lives, 0)
-                        screen_shake = 5
-                        play_sound(hit_sound)
-
-                        for _ in range(15):
-                            particles.append(
-                                Particle(player.centerx, player.centery,
-                                        random.uniform(-5, 5),
-                                        random.uniform(-5, 5))
-                            )
-
-                        try:
-                            enemies.remove(enemy)
-                        except ValueError:
-                            pass
-
-                        shockwaves.append(Shockwave(player.centerx, player.centery))
-
-                        # ---------- HACK INTERCEPT ----------
-                        if lives == 0 and hack_available and not hacked_enemy:
-                            hack_mode = True
-                            hack_available = False
-                            pygame.mouse.set_visible(True)
-                            continue   # CRITICAL: skip game over
-                        # -----------------------------------
-
-                        # If already hacked and die again → real GAME OVER
-                        if lives == 0 and hacked_enemy:
-                            game_state = GAME_OVER
-                            if score > high_score:
-                                high_score = score
-                                save_high_score(high_score)
+                    self.lives -= 1
+                    self.lives = max(self.lives, 0)
+                    self.screen_shake = 5
+                    play_sound(hit_sound)
+
+                    self.particles.burst(15, self.player.centerx, self.player.centery, (-150, 150), (-150, 150))
+
+                    self.kills.push(enemy, points=0)
+
+                    self.shockwaves.append(Shockwave(self.player.centerx, self.player.centery))
+
+                    # ---------- HACK INTERCEPT ----------
+                    if self.lives == 0 and self.hack_available and not self.hacked_enemy:
+                        self.hack_mode = True
+                        self.hack_available = False
+                        continue   # CRITICAL: skip game over
+                    # -----------------------------------
+
+                    # If already hacked and die again → real GAME OVER
+                    if self.lives == 0 and self.hacked_enemy:
+                        self.state = GAME_OVER
+                        if self.score > self.high_score:
+                            self.high_score = self.score
+                            self.save_high_score()
+        profiler.lap("enemies")
 
 
         # --- Overdrive burning ring damage
-        if overdrive_active:
+        if self.overdrive_active:
             burn_radius = 90
-            for enemy in enemies[:]:
-                dx = enemy.rect.centerx - player.centerx
-                dy = enemy.rect.centery - player.centery
-                dist_sq = dx * dx + dy * dy
-                if dist_sq <= burn_radius * burn_radius:
-                    enemy.health -= 0.18
-                    if random.random() < 0.35:
-                        particles.append(Particle(enemy.rect.centerx + random.uniform(-6, 6),
-                                                 enemy.rect.centery + random.uniform(-6, 6),
-                                                 random.uniform(-2, 2),
-                                                 random.uniform(-2, 2),
-                                                 lifetime=14,
-                                                 color=(255, 80, 30)))
-                    if enemy.health <= 0:
-                        try:
-                            enemies.remove(enemy)
-                        except ValueError:
-                            pass
-                        score += 1 if enemy.type == EnemyType.DRONE else (2 if enemy.type == EnemyType.FIGHTER else 3)
-                        overdrive_points += 0.2
-                        if overdrive_points >= 5:
-                            overdrive_ready = True
+            hits = aoe_circle(self.enemies.centers(), self.player.centerx, self.player.centery, burn_radius)
+            for enemy in self.enemies.select(hits):
+                enemy.health -= 5.4 * dt
+                if random.random() < 10.5 * dt:
+                    self.particles.emit(enemy.rect.centerx + random.uniform(-6, 6),
+                                   enemy.rect.centery + random.uniform(-6, 6),
+                                   random.uniform(-60, 60),
+                                   random.uniform(-60, 60),
+                                   lifetime=0.47,
+                                   color=(255, 80, 30))
+                if enemy.health <= 0:
+                    self.kills.push(enemy, overdrive=0.2)
+        profiler.lap("aoe")
 
         # Rapid fire
-        if rapid_fire:
-            rapid_fire_counter += 1
-            if rapid_fire_counter >= 3:
-                missiles.append(pygame.Rect(player.centerx - 5, player.top, 10, 20))
-                play_sound(overdrive_sound if overdrive_active else (rapid_fire_sound if rapid_fire_sound else shoot_sound))
-                rapid_fire_counter = 0
+        if self.rapid_fire:
+            self.rapid_fire_counter += dt
+            if self.rapid_fire_counter >= RAPID_FIRE_INTERVAL:
+                self.missiles.append(pygame.Rect(self.player.centerx - 5, self.player.top, 10, 20))
+                play_sound(overdrive_sound if self.overdrive_active else (rapid_fire_sound if rapid_fire_sound else shoot_sound))
+                self.rapid_fire_counter -= RAPID_FIRE_INTERVAL
 
         # Power-up collection
-        for powerup in powerups[:]:
-            if hacked_enemy:
+        for powerup in self.powerups[:]:
+            if self.hacked_enemy:
                 continue
-            if powerup.rect.colliderect(player):
+            if powerup.rect.colliderect(self.player):
                 if powerup.type == PowerUpType.SHIELD:
                     play_sound(shield_sound or powerup_sound)
-                    player_shield = True
-                    player_shield_time = 5
+                    self.player_shield = True
+                    self.player_shield_time = 5
                 elif powerup.type == PowerUpType.RAPID_FIRE:
                     play_sound(rapid_fire_sound or powerup_sound)
-                    rapid_fire = True
-                    rapid_fire_time = 8
+                    self.rapid_fire = True
+                    self.rapid_fire_time = 8
                 elif powerup.type == PowerUpType.INVINCIBILITY:
                     play_sound(warp_sound or powerup_sound)
-                    player_invincible = True
-                    player_invincible_time = 5
+                    self.player_invincible = True
+                    self.player_invincible_time = 5
                 elif powerup.type == PowerUpType.ORBITAL:
                     play_sound(orbital_sound or powerup_sound)
-                    orbital_count += 1
-                    orbital_charging = True
-                    orbital_charge_time = orbital_charge_duration
-                    player_invincible = True
-                    player_invincible_time = orbital_charge_duration + orbital_beam_duration
+                    self.orbital_count += 1
+                    self.orbital_charging = True
+                    self.orbital_charge_time = orbital_charge_duration
+                    self.player_invincible = True
+                    self.player_invincible_time = orbital_charge_duration + orbital_beam_duration
                 elif powerup.type == PowerUpType.PLASMA:
                     play_sound(plasma_sound or powerup_sound)
-                    plasma_active = True
-                    plasma_radius = 1.0
-                    plasma_hits.clear()
+                    self.plasma_active = True
+                    self.plasma_radius = 1.0
+                    self.plasma_hits.clear()
                 elif powerup.type == PowerUpType.CUTTER:
                     # activate cutter: begin spinning immediately for cutter_spin_duration
                     play_sound(powerup_sound or overdrive_sound)
-                    cutter_blades.clear()
+                    self.cutter_blades.clear()
                     for i in range(cutter_blade_count):
                         ang = (i / cutter_blade_count) * math.tau
-                        cutter_blades.append(CutterBlade(ang))
-                    cutter_active = True
-                    cutter_active_time = cutter_spin_duration
+                        self.cutter_blades.append(CutterBlade(self.player, ang))
+                    self.cutter_active = True
+                    self.cutter_active_time = cutter_spin_duration
                 elif powerup.type == PowerUpType.ARTILLERY:
                     # give the player one artillery charge
                     play_sound(powerup_sound or overdrive_sound)
-                    artillery_available += 1
+                    self.artillery_available += 1
                 try:
-                    powerups.remove(powerup)
+                    self.powerups.remove(powerup)
                 except ValueError:
                     pass
+        profiler.lap("pickups")
 
         # Missile collision & movement
-        for missile in missiles[:]:
-            missile.y -= missile_speed
+        step = self.whole_pixels('missiles', missile_speed * dt)
+        for missile in self.missiles[:]:
+            missile.y -= step
             if missile.bottom < 0:
                 try:
-                    missiles.remove(missile)
+                    self.missiles.remove(missile)
                 except ValueError:
                     pass
                 continue
-            for enemy in enemies[:]:
-                if missile.colliderect(enemy.rect):
-                    enemy.health -= 1
-                    for _ in range(10):
-                        particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, random.uniform(-4, 4), random.uniform(-4, 4)))
-                    if enemy.health <= 0:
-                        try:
-                            enemies.remove(enemy)
-                        except ValueError:
-                            pass
-                        base_score = 1 if enemy.type == EnemyType.DRONE else (2 if enemy.type == EnemyType.FIGHTER else 3)
-                        score += base_score
-                        if enemy.type == EnemyType.CAPITAL:
-                            overdrive_points += 1
-                            if overdrive_points >= 5:
-                                overdrive_ready = True
-                        if random.random() < 1.0:
-                            powerup_type = random.choices(
-                                [PowerUpType.SHIELD, PowerUpType.RAPID_FIRE, PowerUpType.INVINCIBILITY, PowerUpType.ORBITAL, PowerUpType.PLASMA, PowerUpType.CUTTER, PowerUpType.ARTILLERY],
-                                weights=[80, 60, 40, 8, 80, 12, 12]
-                            )[0]
-                            powerups.append(PowerUp(enemy.rect.centerx, enemy.rect.centery, powerup_type))
-                    if missile in missiles:
-                        try:
-                            missiles.remove(missile)
-                        except ValueError:
-                            pass
-                    break
+            for enemy in self.enemies.query_rect(missile):
+                enemy.health -= 1
+                self.particles.burst(10, enemy.rect.centerx, enemy.rect.centery, (-120, 120), (-120, 120))
+                if enemy.health <= 0:
+                    self.kills.push(enemy, overdrive=1 if enemy.type == EnemyType.CAPITAL else 0, drop=True)
+                if missile in self.missiles:
+                    try:
+                        self.missiles.remove(missile)
+                    except ValueError:
+                        pass
+                break
 
         # Support drone missiles
-        for m in support_drone_missiles[:]:
-            m.y -= 10
+        step = self.whole_pixels('drone_missiles', DRONE_MISSILE_SPEED * dt)
+        for m in self.support_drone_missiles[:]:
+            m.y -= step
             if m.bottom < 0:
-                support_drone_missiles.remove(m)
+                self.support_drone_missiles.remove(m)
                 continue
 
             # collision with enemies
-            for enemy in enemies[:]:
-                if m.colliderect(enemy.rect):
-                    enemy.health -= 0.5  # weaker than player bullet
-                    particles.append(Particle(enemy.rect.centerx, enemy.rect.centery,
-                                            random.uniform(-2,2), random.uniform(-2,2), lifetime=14))
-                    if enemy.health <= 0:
-                        enemies.remove(enemy)
-                        score += 1 if enemy.type == EnemyType.DRONE else (2 if enemy.type == EnemyType.FIGHTER else 3)
-                    try:
-                        support_drone_missiles.remove(m)
-                    except: pass
-                    break
-       
-        # Particle cleanup
-        for particle in particles[:]:
-            if not particle.update():
+            for enemy in self.enemies.query_rect(m):
+                enemy.health -= 0.5  # weaker than player bullet
+                self.particles.emit(enemy.rect.centerx, enemy.rect.centery,
+                               random.uniform(-60, 60), random.uniform(-60, 60), lifetime=0.47)
+                if enemy.health <= 0:
+                    self.kills.push(enemy)
                 try:
-                    particles.remove(particle)
-                except ValueError:
-                    pass
-        for sw in shockwaves[:]:
-            if not sw.update():
-                try:
-                    shockwaves.remove(sw)
-                except ValueError:
-                    pass
+                    self.support_drone_missiles.remove(m)
+                except: pass
+                break
+        profiler.lap("missiles")
+   
+        # Particle integration + cleanup (batched)
+        self.particles.update(dt)
+        self.shockwaves[:] = [sw for sw in self.shockwaves if sw.update(dt)]
+        profiler.lap("particles")
 
         # Orbital update
-        if orbital_charging:
-            orbital_charge_time -= 1 / 30
-            if orbital_charge_time <= 0:
-                orbital_charging = False
-                orbital_beam_active = True
-                orbital_beam_time = orbital_beam_duration
-                player_invincible = True
-                player_invincible_time = max(player_invincible_time, orbital_beam_duration)
+        if self.orbital_charging:
+            self.orbital_charge_time -= dt
+            if self.orbital_charge_time <= 0:
+                self.orbital_charging = False
+                self.orbital_beam_active = True
+                self.orbital_beam_time = orbital_beam_duration
+                self.player_invincible = True
+                self.player_invincible_time = max(self.player_invincible_time, orbital_beam_duration)
                 for _ in range(8):
                     enemy_type = random.choices([EnemyType.DRONE, EnemyType.FIGHTER, EnemyType.CAPITAL], weights=[50, 35, 15])[0]
                     x = random.randint(0, WIDTH - 40)
-                    enemies.append(Enemy(x, -40, enemy_type))
+                    self.enemies.spawn(x, -40, enemy_type)
 
-        if orbital_beam_active:
-            orbital_beam_time -= 1 / 30
+        if self.orbital_beam_active:
+            self.orbital_beam_time -= dt
             cone_width_bottom = 40
             cone_width_top = WIDTH
-            enemies_hit = []
-            for enemy in enemies[:]:
-                enemy_y = enemy.rect.centery
-                if 0 <= enemy_y <= player.top:
-                    progress = 1 - (enemy_y / player.top)
-                    width_at_y = cone_width_bottom + (cone_width_top - cone_width_bottom) * progress
-                    cone_x_left = player.centerx - width_at_y / 2
-                    cone_x_right = player.centerx + width_at_y / 2
-                    if cone_x_left <= enemy.rect.centerx <= cone_x_right:
-                        enemies_hit.append(enemy)
-                        for _ in range(15):
-                            particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, random.uniform(-5, 5), random.uniform(-5, 5), color=(255, 255, 255)))
-                        score += 1 if enemy.type == EnemyType.DRONE else (2 if enemy.type == EnemyType.FIGHTER else 3)
-            for enemy in enemies_hit:
-                try:
-                    enemies.remove(enemy)
-                except ValueError:
-                    pass
-            if orbital_beam_time <= 0:
-                orbital_beam_active = False
+            hits = aoe_cone(self.enemies.centers(), self.player.centerx, self.player.top, 0, cone_width_bottom, cone_width_top)
+            for enemy in self.enemies.select(hits):
+                self.kills.push(enemy, fx=(15, 150, (255, 255, 255)))
+            if self.orbital_beam_time <= 0:
+                self.orbital_beam_active = False
                 try:
                     if globals().get('orbital_sound', None):
                         globals()['orbital_sound'].stop()
@@ -1380,116 +3111,233 @@ def main():
                     pass
 
         # --- Cutter update (orbiting blades + launch & explosion)
-        if cutter_active:
+        if self.cutter_active:
             # spin phase
-            if cutter_active_time > 0:
-                cutter_active_time -= 1 / 30
-                for blade in cutter_blades[:]:
+            if self.cutter_active_time > 0:
+                self.cutter_active_time -= dt
+                for blade in self.cutter_blades[:]:
                     if blade.state == 'orbit':
-                        blade.update_orbit(spin_speed=0.16)
+                        blade.update_orbit(dt)
                         # instant destroy enemies that touch the blade while orbiting
-                        for enemy in enemies[:]:
-                            if blade.rect.colliderect(enemy.rect):
-                                try:
-                                    enemies.remove(enemy)
-                                except ValueError:
-                                    pass
-                                for _ in range(12):
-                                    particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, random.uniform(-4,4), random.uniform(-4,4)))
-                                score += 1 if enemy.type == EnemyType.DRONE else (2 if enemy.type == EnemyType.FIGHTER else 3)
+                        for enemy in self.enemies.query_rect(blade.rect):
+                            self.kills.push(enemy, fx=(12, 120, (0, 255, 255)))
                 # if timer just reached 0, launch blades
-                if cutter_active_time <= 0:
-                    for blade in cutter_blades:
+                if self.cutter_active_time <= 0:
+                    for blade in self.cutter_blades:
                         blade.launch()
-                    play_sound(overdrive_sound if overdrive_active else powerup_sound)
+                    play_sound(overdrive_sound if self.overdrive_active else powerup_sound)
             else:
                 # launched phase
-                for blade in cutter_blades[:]:
+                for blade in self.cutter_blades[:]:
                     if blade.state == 'launched':
-                        blade.update_launched()
+                        blade.update_launched(dt)
                         # out of bounds removal
                         if blade.x < -50 or blade.x > WIDTH + 50 or blade.y < -50 or blade.y > HEIGHT + 50:
                             try:
-                                cutter_blades.remove(blade)
+                                self.cutter_blades.remove(blade)
                             except ValueError:
                                 pass
                             continue
                         # check collision with enemies -> big explosion
                         collision_occurred = False
-                        for enemy in enemies[:]:
-                            if blade.rect.colliderect(enemy.rect):
-                                collision_occurred = True
-                                ex = int(blade.x)
-                                ey = int(blade.y)
-                                # explosion visuals
-                                for _ in range(30):
-                                    particles.append(Particle(ex + random.uniform(-8,8), ey + random.uniform(-8,8), random.uniform(-5,5), random.uniform(-5,5), lifetime=30, color=(255,180,60)))
-                                shockwaves.append(Shockwave(ex, ey))
-                                # remove/damage enemies within radius
-                                for e in enemies[:]:
-                                    dx = e.rect.centerx - ex
-                                    dy = e.rect.centery - ey
-                                    if dx*dx + dy*dy <= blade_explosion_radius * blade_explosion_radius:
-                                        try:
-                                            enemies.remove(e)
-                                        except ValueError:
-                                            pass
-                                        score += 1 if e.type == EnemyType.DRONE else (2 if e.type == EnemyType.FIGHTER else 3)
-                                # remove blade after explosion
-                                try:
-                                    cutter_blades.remove(blade)
-                                except ValueError:
-                                    pass
-                                break
+                        for enemy in self.enemies.query_rect(blade.rect):
+                            collision_occurred = True
+                            ex = int(blade.x)
+                            ey = int(blade.y)
+                            # explosion visuals
+                            self.particles.burst(30, (ex - 8, ex + 8), (ey - 8, ey + 8), (-150, 150), (-150, 150), lifetime=1.0, color=(255, 180, 60))
+                            self.shockwaves.append(Shockwave(ex, ey))
+                            # remove/damage enemies within radius
+                            hits = aoe_circle(self.enemies.centers(), ex, ey, blade_explosion_radius)
+                            for e in self.enemies.select(hits):
+                                self.kills.push(e)
+                            # remove blade after explosion
+                            try:
+                                self.cutter_blades.remove(blade)
+                            except ValueError:
+                                pass
+                            break
                         # if no immediate collision, blade continues until out of bounds
                 # if all blades gone -> deactivate cutter
-                if not cutter_blades:
-                    cutter_active = False
-                    cutter_active_time = 0.0
+                if not self.cutter_blades:
+                    self.cutter_active = False
+                    self.cutter_active_time = 0.0
 
         # --- Artillery pending impact handling (after target picked)
-        if artillery_pending:
-            artillery_drop_timer -= 1 / 30
-            if artillery_drop_timer <= 0:
+        if self.artillery_pending:
+            self.artillery_drop_timer -= dt
+            if self.artillery_drop_timer <= 0:
                 # Impact now
-                ex, ey = artillery_target_pos
+                ex, ey = self.artillery_target_pos
                 # big explosion visuals
-                for _ in range(80):
-                    particles.append(Particle(ex + random.uniform(-24,24), ey + random.uniform(-24,24), random.uniform(-8,8), random.uniform(-8,8), lifetime=40, color=(255,180,60)))
-                shockwaves.append(Shockwave(ex, ey))
-                screen_shake = max(screen_shake, 12)
+                self.particles.burst(80, (ex - 24, ex + 24), (ey - 24, ey + 24), (-240, 240), (-240, 240), lifetime=1.33, color=(255, 180, 60))
+                self.shockwaves.append(Shockwave(ex, ey))
+                self.screen_shake = max(self.screen_shake, 12)
                 play_sound(artillery_sound or hit_sound)
                 # damage/remove enemies within radius
-                for e in enemies[:]:
-                    dx = e.rect.centerx - ex
-                    dy = e.rect.centery - ey
-                    if dx*dx + dy*dy <= artillery_radius * artillery_radius:
-                        try:
-                            enemies.remove(e)
-                        except ValueError:
-                            pass
-                        score += 1 if e.type == EnemyType.DRONE else (2 if e.type == EnemyType.FIGHTER else 3)
+                hits = aoe_circle(self.enemies.centers(), ex, ey, artillery_radius)
+                for e in self.enemies.select(hits):
+                    self.kills.push(e)
                 # damage player if within radius (can kill player)
-                pdx = player.centerx - ex
-                pdy = player.centery - ey
+                pdx = self.player.centerx - ex
+                pdy = self.player.centery - ey
                 if pdx*pdx + pdy*pdy <= artillery_radius * artillery_radius:
                     # heavy hit: remove a life and create visual
-                    lives -= 1
-                    for _ in range(20):
-                        particles.append(Particle(player.centerx + random.uniform(-20,20), player.centery + random.uniform(-20,20), random.uniform(-5,5), random.uniform(-5,5), lifetime=30, color=(255,80,20)))
-                    shockwaves.append(Shockwave(player.centerx, player.centery))
+                    self.lives -= 1
+                    self.particles.burst(20, (self.player.centerx - 20, self.player.centerx + 20), (self.player.centery - 20, self.player.centery + 20), (-150, 150), (-150, 150), lifetime=1.0, color=(255, 80, 20))
+                    self.shockwaves.append(Shockwave(self.player.centerx, self.player.centery))
                     play_sound(hit_sound)
-                    if hacked_enemy and lives <= 0:
-                        game_state = GAME_OVER
-                        if score > high_score:
-                            high_score = score
-                            save_high_score(high_score)
+                    if self.hacked_enemy and self.lives <= 0:
+                        self.state = GAME_OVER
+                        if self.score > self.high_score:
+                            self.high_score = self.score
+                            self.save_high_score()
                 # finalize
-                artillery_pending = False
-                artillery_drop_timer = 0.0
+                self.artillery_pending = False
+                self.artillery_drop_timer = 0.0
+        profiler.lap("aoe")
+
+        # Apply every kill queued this step in one pass
+        gained, overdrive_gained = self.kills.resolve(self.particles, self.powerups)
+        self.score += gained
+        if overdrive_gained:
+            self.overdrive_points += overdrive_gained
+            if self.overdrive_points >= 5:
+                self.overdrive_ready = True
+        profiler.lap("kills")
+
 
-        draw_window()
+# --- Main loop
+def main():
+    init_display()
+    init_audio()
+    atlas.build()
+    game = Game()
+    if ALLOC_TRACKING:
+        alloc_tracker.start()
+    if TELEMETRY:
+        telemetry.start()
+    if SPIKE_CAPTURE:
+        spike_capture.start()
+    running = True
+    sim_lag = 0.0
+    inputs = 0      # TELEMETRY_INPUTS pressed since the last recorded frame
+    last_time = time.perf_counter()
+    shown = None    # idle screen currently on the display
+
+    while running:
+        clock.tick(RENDER_FPS_CAP)
+        now = time.perf_counter()
+        frame_time = min(now - last_time, MAX_FRAME_TIME)
+        last_time = now
+
+        if game.state == PAUSED:
+            if shown != PAUSED:
+                draw_pause()
+                shown = PAUSED
+            for event in wait_events(IDLE_WAIT_MS):
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                    game.state = PLAYING
+                if event.type == pygame.WINDOWEXPOSED:
+                    shown = None
+            last_time = time.perf_counter()
+            continue
+
+        if game.state == GAME_OVER:
+            if shown != GAME_OVER:
+                draw_game_over(game)
+                shown = GAME_OVER
+            for event in wait_events(IDLE_WAIT_MS):
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        game.reset()
+                    if event.key == pygame.K_q:
+                        running = False
+                if event.type == pygame.WINDOWEXPOSED:
+                    shown = None
+            last_time = time.perf_counter()
+            continue
+        shown = None
+
+        if game.artillery_targeting or game.hack_mode:
+            # nothing moves until a target is picked: redraw the pointer
+            # overlay, then sleep until input (or the next scan ring step)
+            pygame.mouse.set_visible(True)
+            frozen_frame.draw(game)
+            events = wait_events(HACK_PULSE_MS if game.hack_mode else IDLE_WAIT_MS)
+        else:
+            frozen_frame.release()
+            events = pygame.event.get()
+        inputs |= input_bits(events)
+
+        for event in events:
+            if event.type == pygame.WINDOWEXPOSED:
+                frozen_frame.release()
+            if event.type == pygame.QUIT:
+                running = False
+                alloc_tracker.close()
+                telemetry.close()
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE and not game.artillery_targeting:
+                    game.fire()
+                if event.key == pygame.K_p:
+                    game.state = PAUSED
+                if event.key == PROFILER_KEY:
+                    profiler.toggle()
+                    # the dirty-rect path has to repaint where the panel was
+                    renderer.invalidate()
+                if event.key == pygame.K_e:
+                    game.activate_overdrive()
+                if event.key == artillery_activation_key and game.begin_artillery():
+                    # capture mouse so player can choose
+                    pygame.mouse.set_visible(True)
+
+            # Mouse click handling during targeting
+            if event.type == pygame.MOUSEBUTTONDOWN and game.artillery_targeting:
+                game.target_artillery(pygame.mouse.get_pos())
+                pygame.mouse.set_visible(False)
+                # resume the game (updates continue)
+            # Mouse click handling during HACK MODE
+            if event.type == pygame.MOUSEBUTTONDOWN and game.hack_mode:
+                if game.hack(pygame.mouse.get_pos()):
+                    pygame.mouse.set_visible(False)
+        # Hack or artillery targeting: the game stays frozen (no timers,
+        # movement, particles or missiles) until a target is picked
+        if game.hack_mode or game.artillery_targeting:
+            last_time = time.perf_counter()
+            continue
 
+        # Fixed-step simulation: the real time elapsed since the last frame is
+        # consumed in SIM_DT steps; the remainder becomes the render interpolation
+        sim_lag += frame_time
+        steps = 0
+        while sim_lag >= SIM_DT:
+            game.update(SIM_DT, pygame.key.get_pressed())
+            steps += 1
+            # background scroll (held still on the dirty-rect path)
+            if not DIRTY_RECTS:
+                starfield.update(SIM_DT)
+            profiler.lap("starfield")
+            sim_lag -= SIM_DT
+            if game.state != PLAYING or game.hack_mode:
+                sim_lag = 0.0
+                break
+
+        draw_window(game, sim_lag / SIM_DT)
+        profiler.end_frame(frame_time)
+        spike_capture.end_frame(game, frame_time)
+        alloc_tracker.end_frame()
+        telemetry.record(game, frame_time, steps, inputs | input_bits((), pygame.key.get_pressed()))
+        inputs = 0
+
+    alloc_tracker.close()
+    telemetry.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,106 @@
+# telemetry.py
+# Reader for the telemetry copilot.py writes (telemetry/session-*.tlm.gz)
+# when its TELEMETRY flag is on.
+# Needs only NumPy, so sessions can be analysed anywhere.
+#
+#   python telemetry.py                        summarize the newest session
+#   python telemetry.py telemetry/session-20260101-120000-000.tlm.gz
+#
+#   >>> import telemetry
+#   >>> records, header = telemetry.load_session("telemetry/session-20260101-120000-000.tlm.gz")
+#   >>> records["frame_ms"].mean(), records["enemies"].max()
+#   >>> telemetry.unpack(records, header, "effects")["plasma_active"].sum()
+#
+# A session is split into numbered parts; naming any part loads all of them.
+# A part cut short by a crash loads up to its last complete record.
+
+import glob
+import json
+import os
+import sys
+import zlib
+
+import numpy as np
+
+MAGIC = b"COPILOT-TELEMETRY 1\n"
+DEFAULT_DIR = "telemetry"
+
+
+def read_part(path):
+    # (records, header) of one part file
+    with open(path, "rb") as f:
+        raw = f.read()
+    # decompress incrementally: an unfinished gzip stream still yields its data
+    data = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(raw)
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path}: not a telemetry file")
+    end = data.index(b"\n", len(MAGIC))
+    header = json.loads(data[len(MAGIC):end])
+    dtype = np.dtype([tuple(field) for field in header["dtype"]])
+    body = data[end + 1:]
+    body = body[:len(body) - len(body) % dtype.itemsize]
+    return np.frombuffer(body, dtype=dtype), header
+
+
+def session_parts(path):
+    # every part of the session `path` belongs to, in order
+    stem = os.path.basename(path).rsplit("-", 1)[0]
+    return sorted(glob.glob(os.path.join(os.path.dirname(path) or ".", stem + "-*.tlm.gz")))
+
+
+def load_session(path):
+    # (records, header) for a whole session; header is the first part's
+    parts = [read_part(p) for p in session_parts(path)]
+    if not parts:
+        raise FileNotFoundError(path)
+    records = np.concatenate([records for records, _ in parts])
+    header = dict(parts[0][1])
+    header["parts"] = len(parts)
+    header["dropped"] = parts[-1][1].get("dropped", 0)
+    return records, header
+
+
+def unpack(records, header, field):
+    # bitmask column ("effects" or "inputs") -> {name: bool array}
+    return {name: (records[field] >> bit) & 1 == 1 for bit, name in enumerate(header[field])}
+
+
+def newest_session(directory=DEFAULT_DIR):
+    parts = sorted(glob.glob(os.path.join(directory, "session-*.tlm.gz")))
+    return parts[-1] if parts else None
+
+
+def summarize(records, header):
+    # a session cut short by a crash misses the drops since its last part began
+    lines = [f"session {header['session']}: {len(records)} frames in {header['parts']} part(s), "
+             f"{header['dropped']} dropped"]
+    if not len(records):
+        return "\n".join(lines)
+    frame_ms = records["frame_ms"]
+    p50, p95, p99 = np.percentile(frame_ms, (50, 95, 99))
+    lines.append(f"  {records['time'][-1]:.1f} s played, final score {records['score'][-1]}")
+    lines.append(f"  frame ms  p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {frame_ms.max():.2f}")
+    for name in ("enemies", "particles", "missiles", "powerups", "shockwaves"):
+        lines.append(f"  {name:<11} mean {records[name].mean():8.1f}  max {records[name].max():6d}")
+    active = {name: int(on.sum()) for name, on in unpack(records, header, "effects").items() if on.any()}
+    lines.append("  frames with effect on: " + (", ".join(f"{k} {v}" for k, v in active.items()) or "none"))
+    used = {name: int(on.sum()) for name, on in unpack(records, header, "inputs").items() if on.any()}
+    lines.append("  frames with input: " + (", ".join(f"{k} {v}" for k, v in used.items()) or "none"))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        newest = newest_session()
+        if newest is None:
+            print(f"no telemetry in {DEFAULT_DIR}/")
+            return 1
+        paths = [newest]
+    for path in paths:
+        print(summarize(*load_session(path)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
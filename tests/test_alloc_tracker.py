@@ -0,0 +1,56 @@
+import os
+import tracemalloc
+
+import pygame
+import pytest
+
+import copilot
+
+pytestmark = pytest.mark.usefixtures("display")
+
+
+@pytest.fixture
+def tracker():
+    # note() and render_text() report to the module's tracker
+    tracker = copilot.alloc_tracker
+    yield tracker
+    tracker.stop()
+
+
+def pygame_creators():
+    return [pygame.Surface] + [getattr(pygame.transform, name) for name in copilot.ALLOC_TRANSFORMS
+                               if hasattr(pygame.transform, name)]
+
+
+def test_stop_restores_pygame(tracker):
+    originals = pygame_creators()
+    tracker.start()
+    assert pygame.Surface is not originals[0]
+    tracker.stop()
+    assert pygame_creators() == originals
+    assert not tracemalloc.is_tracing()
+    assert not tracker.active
+
+
+def test_restore_after_failed_start(tracker, monkeypatch):
+    originals = pygame_creators()
+    monkeypatch.setattr(tracker, "snapshot", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        tracker.start()
+    assert pygame_creators() == originals
+    assert not tracemalloc.is_tracing()
+    assert not tracker.active
+
+
+def test_counts_surfaces_at_call_site(tracker):
+    tracker.start()
+    pygame.Surface((10, 10))                                # 1
+    copilot.render_text(copilot.small_font, "x", copilot.WHITE)  # 1
+    tracker.note(pygame.Surface((4, 4)).convert())          # 2: constructor + convert
+    pygame.transform.scale(pygame.Surface((4, 4)), (8, 8))  # 2
+    tracker.end_frame()
+    assert tracker.surface_counts == [6]
+    # every surface is charged to a line of this file, not to the tracker
+    sites = {site.split(":")[0] for site in tracker.surfaces}
+    assert sites == {os.path.basename(__file__)}
+    assert tracker.summary()["surfaces_per_frame"] == 6
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import bench
+import copilot
+
+SMOKE_FRAMES = 5
+
+pytestmark = pytest.mark.usefixtures("display")
+
+
+@pytest.mark.parametrize("name", list(bench.SCENARIOS))
+def test_scenario_runs(name):
+    update_ms, draw_ms = bench.run_scenario(name, frames=SMOKE_FRAMES)
+    for samples in (update_ms, draw_ms):
+        assert samples.shape == (SMOKE_FRAMES,)
+        assert np.isfinite(samples).all() and (samples >= 0).all()
+    result = bench.summarize(update_ms, draw_ms)
+    assert set(result) == {f"{part}_p{p}" for part in ("update", "draw", "frame") for p in bench.PERCENTILES}
+
+
+def test_seed_replays_same_game(monkeypatch):
+    # the same seed plays the same game whatever ran before it
+    games = []
+    setup = bench.SCENARIOS["late_game"]
+    monkeypatch.setitem(bench.SCENARIOS, "late_game", lambda game: games.append(game) or setup(game))
+
+    def final_state():
+        bench.run_scenario("late_game", frames=60)
+        game = games[-1]
+        return game.score, game.lives, len(game.enemies), len(game.particles)
+
+    first = final_state()
+    bench.run_scenario("particles_10k", frames=SMOKE_FRAMES)
+    assert final_state() == first
+
+
+def test_scenario_under_tracker():
+    tracker = copilot.alloc_tracker
+    try:
+        bench.run_scenario("late_game", frames=SMOKE_FRAMES, tracker=tracker)
+        assert len(tracker.surface_counts) == SMOKE_FRAMES
+    finally:
+        tracker.stop()
+
+
+def test_compare_skips_ungated():
+    baseline = {"late_game": {"draw_p95": 1.0, "draw_p99": 1.0}}
+    result = {"draw_p95": 2.0, "draw_p99": 2.0}
+    regressions = bench.compare("late_game", result, baseline, bench.TOLERANCE)
+    assert len(regressions) == 1 and regressions[0].startswith("draw_p95")
@@ -0,0 +1,89 @@
+import math
+import random
+
+import pygame
+import pytest
+
+import copilot
+from bench import HeldKeys
+from copilot import EnemyType, ENEMY_SIZE, SIM_DT
+
+pytestmark = pytest.mark.usefixtures("display")
+
+
+@pytest.fixture
+def game():
+    random.seed(1)
+    return copilot.Game(score_file=None)
+
+
+def test_plasma_hits_enemy_closing_inside_front(game):
+    # the ship flies at an enemy 55 px outside the ring; the two close
+    # faster than the front grows, so the enemy gets inside the old radius
+    game.plasma_active = True
+    game.plasma_radius = 50.0
+    offset = 105 / math.sqrt(2)
+    x = game.player.centerx - offset - ENEMY_SIZE // 2
+    y = game.player.centery - offset - ENEMY_SIZE // 2
+    game.enemies.spawn(x, y, EnemyType.DRONE)
+    keys = HeldKeys([pygame.K_a, pygame.K_w])
+    while game.plasma_active:
+        game.update(SIM_DT, keys)
+    assert game.score == 1
+    assert game.lives == 3
+
+
+def test_orbital_beam_drawn_where_it_hits(game):
+    # with the ship near the top, the beam kills exactly what it draws over
+    game.player.top = 60
+    game.player_prev.topleft = game.player.topleft
+    game.orbital_beam_active = True
+    game.orbital_beam_time = 1.0
+    inside = (game.player.centerx + 250, 25)
+    outside = (game.player.centerx - 250, 52)
+    for x, y in (inside, outside):
+        game.enemies.spawn(x - ENEMY_SIZE // 2, y - ENEMY_SIZE // 2, EnemyType.DRONE)
+    copilot.draw_window(game, present=False)
+    assert copilot.world.get_at(inside)[:3] != copilot.BLACK_SPACE[:3]
+    assert copilot.world.get_at(outside)[:3] == copilot.BLACK_SPACE[:3]
+    game.update(SIM_DT, HeldKeys())
+    assert game.score == 1
+
+
+def test_kill_queue_scores_each_enemy_once(game):
+    store = game.enemies
+    enemies = [store.spawn(100 * i, 50, EnemyType.FIGHTER) for i in range(4)]
+    assert game.kills.push(enemies[1])
+    assert not game.kills.push(enemies[1])      # killed twice in one frame
+    game.kills.push(enemies[2], points=0)
+    gained, _ = game.kills.resolve(game.particles, game.powerups)
+    assert gained == copilot.ENEMY_SCORE[EnemyType.FIGHTER]
+    assert list(store) == [enemies[0], enemies[3]]
+    # surviving views follow their rows through the compaction
+    assert enemies[3].index == 1 and enemies[3].rect.x == 300
+    assert not enemies[1].alive and enemies[1].rect.x == 100
+    assert store.centers().tolist() == [[20, 70], [320, 70]]
+
+
+def test_kill_bursts_fill_nearly_full_pool(game):
+    # a batched burst takes only what fits in the particle pool
+    particles = game.particles
+    free = 5
+    particles.burst(particles.capacity - free, 0, 0, 0, 0)
+    enemies = [game.enemies.spawn(100 * i, 50, EnemyType.DRONE) for i in range(3)]
+    for enemy in enemies:
+        game.kills.push(enemy, fx=(15, 150, (0, 255, 255)))
+    game.kills.resolve(particles, game.powerups)
+    assert len(particles) == particles.capacity
+    assert particles.pos[-free:].tolist() == [[20, 70]] * free
+
+
+def test_pause_over_targeting_redraws_frozen_frame(game):
+    # unpausing back into artillery targeting shows the game, not the pause screen
+    game.artillery_available = 1
+    game.begin_artillery()
+    copilot.frozen_frame.draw(game)
+    copilot.draw_pause()
+    paused = pygame.image.tobytes(copilot.screen, "RGB")
+    copilot.frozen_frame.draw(game)
+    assert pygame.image.tobytes(copilot.screen, "RGB") != paused
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+import copilot
+
+
+def test_capture_and_rotate(tmp_path):
+    # three older captures on disk; keeping two leaves the newest old one and ours
+    old = [f"spike-20000101-000000-00{i}" for i in range(3)]
+    for stem in old:
+        for ext in (".json", ".prof"):
+            (tmp_path / (stem + ext)).write_text("{}")
+    capture = copilot.SpikeCapture(budget_ms=10, frames=2, directory=str(tmp_path), keep=2)
+    game = copilot.Game(score_file=None)
+    capture.end_frame(game, 0.050)
+    assert capture.profile is None      # off until started
+    capture.start()
+    capture.end_frame(game, 0.005)
+    assert capture.profile is None
+    capture.end_frame(game, 0.050)      # the spike
+    assert capture.profile is not None
+    capture.end_frame(game, 0.016)
+    capture.end_frame(game, 0.016)
+    assert capture.profile is None
+
+    stems = sorted(name[:-5] for name in os.listdir(tmp_path) if name.endswith(".json"))
+    assert len(stems) == 2 and stems[0] == old[-1]
+    assert sorted(os.listdir(tmp_path)) == sorted(stem + ext for stem in stems for ext in (".json", ".prof"))
+    with open(tmp_path / (stems[1] + ".json")) as f:
+        snapshot = json.load(f)
+    assert snapshot["frame_ms"] == 50.0
+    assert snapshot["budget_ms"] == 10
+    assert snapshot["profiled_frames_ms"] == [16.0, 16.0]
+    assert snapshot["top_cumulative"]
+
+
+def test_unsaved_capture_warns_and_stops(tmp_path):
+    blocked = tmp_path / "spikes"
+    blocked.write_text("")              # a file where the directory should go
+    capture = copilot.SpikeCapture(budget_ms=10, frames=1, directory=str(blocked))
+    capture.start()
+    game = copilot.Game(score_file=None)
+    capture.end_frame(game, 0.050)
+    with pytest.warns(RuntimeWarning, match="spike capture disabled"):
+        capture.end_frame(game, 0.016)
+    assert not capture.active
+    capture.end_frame(game, 0.050)
+    assert capture.profile is None
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+import copilot
+import telemetry
+
+FRAMES = 50
+
+
+def record_session(directory, batch=None):
+    # records FRAMES frames; with a batch size, waits for the writer after each batch
+    game = copilot.Game(score_file=None)
+    recorder = copilot.TelemetryRecorder(capacity=64)
+    recorder.start(str(directory))
+    try:
+        for frame in range(FRAMES):
+            game.score = frame
+            game.plasma_active = frame % 2 == 1
+            recorder.record(game, 0.016, 1, copilot.TELEMETRY_CLICK_BIT if frame == 3 else 0)
+            if batch and frame % batch == batch - 1:
+                deadline = time.monotonic() + 5
+                while recorder.tail < recorder.head and time.monotonic() < deadline:
+                    time.sleep(0.001)
+    finally:
+        recorder.close()
+
+
+def test_round_trip(tmp_path):
+    record_session(tmp_path)
+    records, header = telemetry.load_session(telemetry.newest_session(str(tmp_path)))
+    assert header["dropped"] == 0
+    assert records["frame"].tolist() == list(range(FRAMES))
+    assert records["score"].tolist() == list(range(FRAMES))
+    assert (abs(records["frame_ms"] - 16) < 1e-3).all()
+    effects = telemetry.unpack(records, header, "effects")
+    assert effects["plasma_active"].tolist() == [frame % 2 == 1 for frame in range(FRAMES)]
+    assert telemetry.unpack(records, header, "inputs")["click"].nonzero()[0].tolist() == [3]
+
+
+def test_parts_load_as_one_session(tmp_path, monkeypatch):
+    # every flush after the first starts a new part; naming any part loads them all
+    monkeypatch.setattr(copilot, "TELEMETRY_ROTATE_BYTES", copilot.TELEMETRY_DTYPE.itemsize * 2)
+    monkeypatch.setattr(copilot, "TELEMETRY_FLUSH_SECONDS", 0.001)
+    record_session(tmp_path, batch=10)
+    parts = telemetry.session_parts(telemetry.newest_session(str(tmp_path)))
+    assert len(parts) > 1
+    records, header = telemetry.load_session(parts[0])
+    assert header["parts"] == len(parts)
+    assert records["frame"].tolist() == list(range(FRAMES))
+
+
+def test_late_drops_counted_on_close(tmp_path, monkeypatch):
+    # records lost after the only part began are counted in a closing part
+    monkeypatch.setattr(copilot, "TELEMETRY_FLUSH_SECONDS", 0.001)
+    game = copilot.Game(score_file=None)
+    recorder = copilot.TelemetryRecorder(capacity=8)
+    recorder.start(str(tmp_path))
+    try:
+        for _ in range(4):
+            recorder.record(game, 0.016, 1, 0)
+        while recorder.tail < recorder.head:
+            time.sleep(0.001)
+        monkeypatch.setattr(copilot, "TELEMETRY_FLUSH_SECONDS", 60)
+        time.sleep(0.05)                # the writer is now in its long wait
+        for _ in range(20):             # overruns the ring by 12
+            recorder.record(game, 0.016, 1, 0)
+    finally:
+        recorder.close()
+    records, header = telemetry.load_session(telemetry.newest_session(str(tmp_path)))
+    frames = records["frame"].tolist()
+    assert frames[:4] == list(range(4)) and frames[-1] == 23
+    assert header["dropped"] == 24 - len(frames) >= 12
+
+
+def test_write_error_warns_and_stops(tmp_path, monkeypatch):
+    monkeypatch.setattr(copilot, "TELEMETRY_FLUSH_SECONDS", 0.001)
+    blocked = tmp_path / "telemetry"
+    blocked.write_text("")              # a file where the directory should go
+    game = copilot.Game(score_file=None)
+    recorder = copilot.TelemetryRecorder(capacity=8)
+    with pytest.warns(RuntimeWarning, match="telemetry disabled"):
+        recorder.start(str(blocked))
+        try:
+            recorder.record(game, 0.016, 1, 0)
+            deadline = time.monotonic() + 5
+            while not recorder.failed and time.monotonic() < deadline:
+                time.sleep(0.001)
+            recorder.record(game, 0.016, 1, 0)
+            assert recorder.head == 1
+        finally:
+            recorder.close()